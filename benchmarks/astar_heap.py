@@ -0,0 +1,111 @@
+"""
+Frontier size and expansion counts of weighted A* on a road-like grid,
+comparing the previous duplicate-push frontier with the indexed heap.
+
+Run from the repository root: python -m benchmarks.astar_heap
+"""
+import random
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from generic_funcs.generic_search import \
+    Node, \
+    PriorityQueue, \
+    SearchStats, \
+    node_to_path, \
+    weighted_astar
+
+Point = Tuple[int, int]
+
+
+class RoadGrid:
+    """4-connected grid whose edges carry a random cost between 1 and 10"""
+    def __init__(self, size: int, seed: int = 0) -> None:
+        self.size: int = size
+        rng: random.Random = random.Random(seed)
+        self._costs: Dict[Tuple[Point, Point], float] = {}
+        for row in range(size):
+            for column in range(size):
+                for other in ((row + 1, column), (row, column + 1)):
+                    if other[0] < size and other[1] < size:
+                        cost: float = float(rng.randint(1, 10))
+                        self._costs[(row, column), other] = cost
+                        self._costs[other, (row, column)] = cost
+
+    def successors(self, point: Point) -> List[Tuple[Point, float]]:
+        row, column = point
+        return [(other, self._costs[point, other])
+                for other in ((row + 1, column), (row - 1, column),
+                              (row, column + 1), (row, column - 1))
+                if (point, other) in self._costs]
+
+    def heuristic(self, goal: Point) -> Callable[[Point], float]:
+        # every edge costs at least 1, so Manhattan distance is consistent
+        def _distance(point: Point) -> float:
+            return abs(point[0] - goal[0]) + abs(point[1] - goal[1])
+        return _distance
+
+
+def legacy_astar(
+        initial: Point,
+        goal_test: Callable[[Point], bool],
+        successors: Callable[[Point], Iterable[Tuple[Point, float]]],
+        heuristic: Callable[[Point], float]
+) -> Tuple[Optional[Node[Point]], int, int]:
+    # the previous astar loop with weighted costs: duplicate pushes and no
+    # closed set, counting expansions and the frontier peak the way
+    # SearchStats does
+    frontier: PriorityQueue[Node[Point]] = PriorityQueue()
+    frontier.push(Node(initial, None, 0.0, heuristic(initial)))
+    explored: Dict[Point, float] = {initial: 0.0}
+    expansions: int = 0
+    peak: int = 1
+    while not frontier.empty:
+        current_node: Node[Point] = frontier.pop()
+        if goal_test(current_node.state):
+            return current_node, expansions, peak
+        expansions += 1
+        for child, edge_cost in successors(current_node.state):
+            new_cost: float = current_node.cost + edge_cost
+            if child not in explored or explored[child] > new_cost:
+                explored[child] = new_cost
+                frontier.push(Node(child, current_node, new_cost,
+                                   heuristic(child)))
+        peak = max(peak, len(frontier._container))
+    return None, expansions, peak
+
+
+def run(size: int) -> None:
+    grid: RoadGrid = RoadGrid(size)
+    start: Point = (0, 0)
+    goal: Point = (size - 1, size - 1)
+
+    def goal_test(point: Point) -> bool:
+        return point == goal
+
+    heuristic: Callable[[Point], float] = grid.heuristic(goal)
+
+    began: float = perf_counter()
+    old, old_expansions, old_peak = legacy_astar(start, goal_test,
+                                                 grid.successors, heuristic)
+    old_time: float = perf_counter() - began
+
+    began = perf_counter()
+    new: Optional[Node[Point]] = weighted_astar(start, goal_test,
+                                                grid.successors, heuristic)
+    new_time: float = perf_counter() - began
+    # counted in a second run, so that the timing above is uninstrumented
+    stats: SearchStats = SearchStats()
+    weighted_astar(start, goal_test, grid.successors, heuristic, stats)
+
+    assert old is not None and new is not None and old.cost == new.cost
+    print(f"{size}x{size} grid, path cost {new.cost:.0f}, "
+          f"{len(node_to_path(new))} cells")
+    print(f"  before: {old_expansions:>8} expansions, "
+          f"peak heap {old_peak:>8}, {old_time:.2f}s")
+    print(f"  after:  {stats.expanded:>8} expansions, "
+          f"peak heap {stats.frontier_peak:>8}, {new_time:.2f}s")
+
+
+if __name__ == "__main__":
+    for grid_size in (50, 100, 200):
+        run(grid_size)
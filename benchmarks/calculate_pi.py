@@ -0,0 +1,66 @@
+"""
+Time to a given number of correct digits of pi: the previous term by term
+Leibniz loop, calculate_pi, calculate_pi_parallel and machin_pi.
+
+Run from the repository root: python -m benchmarks.calculate_pi
+"""
+import math
+from os import cpu_count
+from time import perf_counter
+from calculatePi import calculate_pi, calculate_pi_parallel, machin_pi
+
+
+def previous_calculate_pi(n_terms: int) -> float:
+    pi: float = 0.0
+    denominator: float = 1.0
+    operation: float = 1.0
+    for _ in range(n_terms):
+        pi += operation * (4.0 / denominator)
+        denominator += 2.0
+        operation *= -1
+    return pi
+
+
+def correct_digits(value: str, reference: str) -> int:
+    # decimal places that agree with reference
+    same: int = 0
+    for a, b in zip(value, reference):
+        if a != b:
+            break
+        same += 1
+    return max(0, same - 2)  # not counting "3."
+
+
+def leibniz(n_terms: int, workers: int) -> None:
+    reference: str = f"{math.pi:.15f}"
+    line: str = f"{n_terms:>11} terms:"
+    for name, function in (("previous", previous_calculate_pi),
+                           ("calculate_pi", calculate_pi),
+                           ("parallel", None)):
+        if name == "previous" and n_terms > 10 ** 7:
+            continue
+        began: float = perf_counter()
+        value: float = function(n_terms) if function is not None else \
+            calculate_pi_parallel(n_terms, workers)
+        elapsed: float = perf_counter() - began
+        line += f"  {name} {elapsed:7.2f}s " \
+                f"({correct_digits(f'{value:.15f}', reference)} digits)"
+    print(line)
+
+
+def machin(digits: int) -> None:
+    reference: str = str(machin_pi(digits + 20))
+    began: float = perf_counter()
+    value: str = str(machin_pi(digits))
+    elapsed: float = perf_counter() - began
+    print(f"machin_pi({digits}): {elapsed:.3f}s "
+          f"({correct_digits(value, reference)} digits)")
+
+
+if __name__ == "__main__":
+    workers: int = cpu_count() or 1
+    print(f"Leibniz series, parallel with {workers} workers")
+    for exponent in range(5, 9):
+        leibniz(10 ** exponent, workers)
+    for digits in (15, 1000, 10_000, 50_000):
+        machin(digits)
@@ -0,0 +1,86 @@
+"""
+string_to_gene before and after sharing codon tuples, codon_ids, and
+codon searches and histograms over codon ids against linear_contains and
+counting in a Gene, on random megabase sequences.
+
+Run from the repository root: python -m benchmarks.codon_ids
+"""
+import random
+import tracemalloc
+from time import perf_counter
+from typing import List
+from dna_search import \
+    Condon, \
+    Gene, \
+    Nucleotide, \
+    codon_histogram, \
+    codon_ids, \
+    ids_contain, \
+    linear_contains, \
+    reading_frames, \
+    string_to_gene
+
+
+def previous_string_to_gene(s: str) -> Gene:
+    gene: Gene = []
+    for i in range(0, len(s) - 2, 3):
+        gene.append((Nucleotide[s[i]], Nucleotide[s[i + 1]],
+                     Nucleotide[s[i + 2]]))
+    return gene
+
+
+def timed(function, *args):
+    # timed first, then run again to trace memory, which slows it down
+    began: float = perf_counter()
+    function(*args)
+    elapsed: float = perf_counter() - began
+    tracemalloc.start()
+    function(*args)
+    peak: int = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def run(length: int, previous: bool) -> None:
+    rng: random.Random = random.Random(length)
+    sequence: str = "".join(rng.choices("ACGT", k=length))
+    print(f"{length} bases")
+    decoders = [("string_to_gene", string_to_gene),
+                ("codon_ids", codon_ids),
+                ("reading_frames", reading_frames)]
+    if previous:
+        decoders.insert(0, ("previous string_to_gene",
+                            previous_string_to_gene))
+    for name, function in decoders:
+        elapsed, peak = timed(function, sequence)
+        print(f"  {name:<24} {elapsed:6.3f}s, peak {peak >> 20}MB")
+
+    gene: Gene = string_to_gene(sequence)
+    ids: bytes = codon_ids(sequence)
+    # frames of a Gene are nucleotide offsets, as for the text it came from
+    assert reading_frames(gene) == reading_frames(sequence[:3 * len(gene)])
+    # a codon moved to the very end, so linear_contains scans it all
+    last: Condon = gene[-1]
+    rare: Gene = [codon for codon in gene if codon != last] + [last]
+    rare_ids: bytes = codon_ids(rare)
+    began: float = perf_counter()
+    assert linear_contains(rare, last)
+    linear: float = perf_counter() - began
+    began = perf_counter()
+    assert ids_contain(rare_ids, last)
+    print(f"  worst case lookup: linear_contains {linear * 1e3:.1f}ms, "
+          f"ids_contain {(perf_counter() - began) * 1e3:.3f}ms")
+
+    began = perf_counter()
+    counts: List[int] = [gene.count(codon) for codon in set(gene)]
+    counted: float = perf_counter() - began
+    began = perf_counter()
+    histogram: List[int] = codon_histogram(ids)
+    assert sorted(counts) == sorted(c for c in histogram if c)
+    print(f"  histogram: list.count per codon {counted:.2f}s, "
+          f"codon_histogram {perf_counter() - began:.3f}s")
+
+
+if __name__ == "__main__":
+    run(1_000_000, True)
+    run(10_000_000, False)
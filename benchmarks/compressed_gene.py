@@ -0,0 +1,72 @@
+"""
+Compress and decompress times of CompressedGene's packed bytearray against
+the previous single-int representation, which is quadratic in the gene
+length, plus random access and slicing on a large gene.
+
+Run from the repository root: python -m benchmarks.compressed_gene
+"""
+import random
+from time import perf_counter
+from compressedGene import CompressedGene
+
+
+def previous_compress(gene: str) -> int:
+    bit_string: int = 1
+    for nucleotide in gene:
+        bit_string = bit_string << 2 | "ACGT".index(nucleotide)
+    return bit_string
+
+
+def previous_decompress(bit_string: int) -> str:
+    gene: str = ""
+    for i in range(0, bit_string.bit_length() - 1, 2):
+        gene += "ACGT"[bit_string >> i & 0b11]
+    return gene[::-1]
+
+
+def run(length: int, previous: bool) -> None:
+    rng: random.Random = random.Random(length)
+    gene: str = "".join(rng.choices("ACGT", k=length))
+    line: str = f"{length:>10} bases:"
+    began: float = perf_counter()
+    compressed: CompressedGene = CompressedGene(gene)
+    middle: float = perf_counter()
+    assert compressed.decompress() == gene
+    line += f" packed {middle - began:7.3f}s + " \
+            f"{perf_counter() - middle:7.3f}s"
+    if previous:
+        began = perf_counter()
+        bit_string: int = previous_compress(gene)
+        middle = perf_counter()
+        assert previous_decompress(bit_string) == gene
+        assert bit_string == compressed.bit_string
+        line += f"  single int {middle - began:7.3f}s + " \
+                f"{perf_counter() - middle:7.3f}s"
+    print(line)
+
+
+def access(length: int, lookups: int) -> None:
+    rng: random.Random = random.Random(0)
+    gene: str = "".join(rng.choices("ACGT", k=length))
+    compressed: CompressedGene = CompressedGene(gene)
+    indexes = [rng.randrange(length) for _ in range(lookups)]
+    began: float = perf_counter()
+    assert "".join(compressed[i] for i in indexes) == \
+        "".join(gene[i] for i in indexes)
+    elapsed: float = perf_counter() - began
+    print(f"{lookups} random bases of {length}: "
+          f"{elapsed / lookups * 1e9:.0f}ns each")
+    began = perf_counter()
+    for i in indexes[:1000]:
+        assert str(compressed[i:i + 1000]) == gene[i:i + 1000]
+    elapsed = perf_counter() - began
+    print(f"1000 slices of 1000 bases of {length}: "
+          f"{elapsed / 1000 * 1e6:.0f}us each")
+
+
+if __name__ == "__main__":
+    for length in (10_000, 100_000, 300_000):
+        run(length, True)
+    for length in (1_000_000, 10_000_000):
+        run(length, False)
+    access(10_000_000, 100_000)
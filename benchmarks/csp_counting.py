@@ -0,0 +1,60 @@
+"""
+Counting the solutions of random map-colouring instances by enumerating
+them with iter_solutions against count_solutions, which splits the map
+into independent pieces and caches their counts.
+
+Run from the repository root: python -m benchmarks.csp_counting
+"""
+from time import perf_counter
+from typing import Dict, List
+from generic_funcs.csp import CSP, MinimumRemainingValues
+from map_coloring import MapColoringConstraint
+from benchmarks.csp_inference import map_csp, random_map
+
+
+def archipelago(islands: int, regions: int, colors: int) -> CSP[str, str]:
+    """islands separate random maps, like Tasmania off the mainland"""
+    variables: List[str] = []
+    borders: List[MapColoringConstraint] = []
+    for island in range(islands):
+        for place_1, place_2 in random_map(regions, island):
+            borders.append(MapColoringConstraint(f"i{island}{place_1}",
+                                                 f"i{island}{place_2}"))
+            variables += [v for v in borders[-1].variables
+                          if v not in variables]
+    palette: List[str] = ["red", "green", "blue", "yellow"][:colors]
+    domains: Dict[str, List[str]] = {v: list(palette) for v in variables}
+    csp: CSP[str, str] = CSP(variables, domains)
+    for border in borders:
+        csp.add_constraint(border)
+    return csp
+
+
+def run(title: str, csp: CSP[str, str], enumerate_too: bool) -> None:
+    line: str = f"{title}:"
+    began: float = perf_counter()
+    count: int = csp.count_solutions()
+    elapsed: float = perf_counter() - began
+    line += f" count_solutions {count} ({csp.nodes_explored} nodes, " \
+            f"{elapsed:.2f}s)"
+    if enumerate_too:
+        began = perf_counter()
+        enumerated: int = sum(1 for _ in csp.iter_solutions(
+            variable_order=MinimumRemainingValues()))
+        elapsed = perf_counter() - began
+        assert enumerated == count
+        line += f"  iter_solutions ({csp.nodes_explored} nodes, " \
+                f"{elapsed:.2f}s)"
+    print(line)
+
+
+if __name__ == "__main__":
+    for seed in range(3):
+        run(f"16 regions, 4 colours, map {seed}", map_csp(16, 4, seed), True)
+    run("25 regions, 4 colours, map 0", map_csp(25, 4, 0), True)
+    # far too many solutions to enumerate from here on
+    run("36 regions, 4 colours, map 0", map_csp(36, 4, 0), False)
+    run("2 islands of 9 regions, 3 colours", archipelago(2, 9, 3), True)
+    run("20 islands of 9 regions, 4 colours", archipelago(20, 9, 4), False)
+    run("10 islands of 16 regions, 4 colours", archipelago(10, 16, 4),
+        False)
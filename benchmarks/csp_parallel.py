@@ -0,0 +1,47 @@
+"""
+Time of one MRV search against solve_parallel's portfolio and split
+strategies on random four-colour maps, where a few instances take far
+longer than the rest for a single search.
+
+Run from the repository root: python -m benchmarks.csp_parallel
+"""
+from os import cpu_count
+from time import perf_counter
+from typing import Dict, Optional
+from generic_funcs.csp import CSP, MinimumRemainingValues, SearchInterrupted
+from benchmarks.csp_inference import map_csp, check
+
+TIME_LIMIT = 10.0  # for the single search, seconds
+
+
+def single(csp: CSP[str, str]) -> Optional[Dict[str, str]]:
+    began: float = perf_counter()
+    return csp.backtracking_search(
+        variable_order=MinimumRemainingValues(),
+        should_stop=lambda: perf_counter() - began > TIME_LIMIT)
+
+
+def run(regions: int, seeds: int, workers: int) -> None:
+    print(f"{regions} regions, 4 colours, {workers} workers")
+    for seed in range(seeds):
+        timings = []
+        for name in ("single", "portfolio", "split"):
+            csp: CSP[str, str] = map_csp(regions, 4, seed)
+            began: float = perf_counter()
+            note: str = ""
+            solution: Optional[Dict[str, str]] = None
+            try:
+                solution = single(csp) if name == "single" else \
+                    csp.solve_parallel(workers, strategy=name)
+                if solution is None:
+                    note = " (none)"
+            except SearchInterrupted:
+                note = " (stopped)"
+            elapsed: float = perf_counter() - began
+            check(csp, solution)
+            timings.append(f"{name} {elapsed:6.2f}s{note}")
+        print(f"  map {seed}: " + "  ".join(timings))
+
+
+if __name__ == "__main__":
+    run(900, 6, max(4, cpu_count() or 1))
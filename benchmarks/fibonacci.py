@@ -0,0 +1,84 @@
+"""
+Time of every fibN variant in fibonacci.py across n, each up to the n it
+can still manage (fib2 and fib3 are capped by the recursion limit), and of
+fib_mod for huge n.
+
+Run from the repository root: python -m benchmarks.fibonacci
+"""
+from collections import deque
+from time import perf_counter
+from typing import Callable, Dict, List
+import fibonacci
+from fibonacci import fib1, fib2, fib3, fib4, fib5, fib6, fib7, fib_mod
+
+
+def last(n: int) -> int:
+    # fib5 yields every number up to F(n)
+    return deque(fib5(n), maxlen=1)[0]
+
+
+def fresh(function: Callable[[int], int]) -> Callable[[int], int]:
+    # fib2 and fib3 start from an empty cache for every n
+    def run(n: int) -> int:
+        fibonacci.memo.clear()
+        fibonacci.memo.update({0: 0, 1: 1})
+        fib3.cache_clear()
+        return function(n)
+    return run
+
+
+VARIANTS: Dict[str, Callable[[int], int]] = {
+    "fib1": fib1,
+    "fib2": fresh(fib2),
+    "fib3": fresh(fib3),
+    "fib4": fib4,
+    "fib5": last,
+    "fib6": fib6,
+    "fib7": fib7,
+}
+# the largest n each variant is timed at
+LIMITS: Dict[str, int] = {
+    "fib1": 25,
+    "fib2": 300,
+    "fib3": 300,
+    "fib4": 200_000,
+    "fib5": 200_000,
+    "fib6": 10_000_000,
+    "fib7": 1_000_000,
+}
+SIZES: List[int] = [20, 25, 300, 10_000, 200_000, 1_000_000, 10_000_000]
+
+
+def timed(function: Callable[[int], int], n: int) -> float:
+    began: float = perf_counter()
+    function(n)
+    return perf_counter() - began
+
+
+if __name__ == "__main__":
+    expected: Dict[int, int] = {n: fib6(n) for n in SIZES[:-1]}
+    print("n".rjust(10) + "".join(name.rjust(11) for name in VARIANTS))
+    for n in SIZES:
+        row: str = str(n).rjust(10)
+        for name, function in VARIANTS.items():
+            if n > LIMITS[name]:
+                row += "-".rjust(11)
+                continue
+            if n in expected:
+                assert function(n) == expected[n]
+            row += f"{timed(function, n) * 1e3:9.2f}ms"
+        print(row)
+    for n in (10 ** 6, 10 ** 12, 10 ** 18):
+        began: float = perf_counter()
+        value: int = fib_mod(n, 10 ** 9 + 7)
+        print(f"fib_mod(10^{len(str(n)) - 1}, 10^9 + 7) = {value} in "
+              f"{(perf_counter() - began) * 1e6:.1f}us")
+    assert fib_mod(10 ** 6, 10 ** 9 + 7) == fib6(10 ** 6) % (10 ** 9 + 7)
+    # negative n is refused rather than looping or giving a wrong number
+    for function in (fib6, fib7, lambda n: fib_mod(n, 10 ** 9 + 7)):
+        for n in (-1, -3, -2 ** 70):
+            try:
+                function(n)
+            except ValueError:
+                continue
+            raise AssertionError(f"no ValueError for n = {n}")
@@ -0,0 +1,66 @@
+"""
+Codon and motif queries through GeneIndex against linear_contains and a
+str.find scan on random megabase sequences.
+
+Run from the repository root: python -m benchmarks.gene_index
+"""
+import itertools
+import random
+from time import perf_counter
+from typing import List
+from dna_search import \
+    Condon, \
+    GeneIndex, \
+    Nucleotide, \
+    linear_contains, \
+    string_to_gene
+
+
+def scan(sequence: str, motif: str) -> List[int]:
+    positions: List[int] = []
+    i: int = sequence.find(motif)
+    while i != -1:
+        positions.append(i)
+        i = sequence.find(motif, i + 1)
+    return positions
+
+
+def run(length: int, motifs: int) -> None:
+    rng: random.Random = random.Random(length)
+    # a gene without the codon TTT, so looking it up scans everything
+    sequence: str = "".join(rng.choices("ACGT", k=length))
+    while "TTT" in sequence:
+        sequence = sequence.replace("TTT", "TAT")
+    gene = string_to_gene(sequence)
+    print(f"{length} bases")
+    began: float = perf_counter()
+    index: GeneIndex = GeneIndex(gene)
+    print(f"  index built in {perf_counter() - began:.2f}s")
+
+    codons: List[Condon] = list(itertools.product(Nucleotide, repeat=3))
+    began = perf_counter()
+    expected: List[bool] = [linear_contains(gene, codon) for codon in codons]
+    linear: float = perf_counter() - began
+    began = perf_counter()
+    assert [index.contains_codon(codon) for codon in codons] == expected
+    indexed: float = perf_counter() - began
+    print(f"  64 codons: linear_contains {linear * 1e3:.1f}ms, "
+          f"index {indexed * 1e3:.3f}ms")
+
+    queries: List[str] = [sequence[i:i + rng.randrange(6, 16)]
+                          for i in rng.sample(range(length - 16), motifs)]
+    began = perf_counter()
+    expected_positions: List[List[int]] = [scan(sequence, motif)
+                                           for motif in queries]
+    scanned: float = perf_counter() - began
+    began = perf_counter()
+    assert [index.positions(motif) for motif in queries] == \
+        expected_positions
+    indexed = perf_counter() - began
+    print(f"  {motifs} motifs, all positions: scan {scanned:.2f}s, "
+          f"index {indexed * 1e3:.1f}ms")
+
+
+if __name__ == "__main__":
+    run(1_000_000, 200)
+    run(3_000_000, 200)
@@ -0,0 +1,85 @@
+"""
+Recursive hanoi on Stacks against the bitwise hanoi_moves generator, which
+must give the same moves, hanoi_state for positions deep into the 2^64 - 1
+moves of 64 discs, and Frame-Stewart with more pegs.
+
+Run from the repository root: python -m benchmarks.hanoi
+"""
+from collections import deque
+from itertools import islice
+from random import Random
+from time import perf_counter
+from typing import List
+from hanoi import Move, Stack, frame_stewart, frame_stewart_moves, hanoi, \
+    hanoi_moves, hanoi_state
+
+
+class Peg(Stack[int]):
+    # a Stack that records each pop and push as a move of hanoi_moves
+    def __init__(self, number: int, n: int, moves: List[Move]) -> None:
+        super().__init__()
+        self.number: int = number
+        self._n: int = n
+        self._moves: List[Move] = moves
+
+    def pop(self) -> int:
+        self._moves.append((0, self.number, 0))
+        return super().pop()
+
+    def push(self, item: int) -> None:
+        super().push(item)
+        if self._moves and self._moves[-1][0] == 0:
+            # hanoi pushes 1 to n with n on top, so item i is disc n + 1 - i
+            self._moves[-1] = (self._n + 1 - item, self._moves[-1][1],
+                               self.number)
+
+
+def recursive_moves(n: int) -> List[Move]:
+    moves: List[Move] = []
+    pegs: List[Peg] = [Peg(number, n, moves) for number in range(3)]
+    for i in range(1, n + 1):
+        pegs[0].push(i)
+    hanoi(pegs[0], pegs[2], pegs[1], n)
+    return moves
+
+
+if __name__ == "__main__":
+    for n in (10, 16, 20):
+        began: float = perf_counter()
+        expected: List[Move] = recursive_moves(n)
+        recursive: float = perf_counter() - began
+        began = perf_counter()
+        assert list(hanoi_moves(n)) == expected
+        bitwise: float = perf_counter() - began
+        began = perf_counter()
+        deque(hanoi_moves(n), maxlen=0)
+        streamed: float = perf_counter() - began
+        print(f"{n} discs, {len(expected)} moves: recursive {recursive:.3f}s,"
+              f" bitwise {bitwise:.3f}s ({streamed:.3f}s without a list)")
+    # every state of 12 discs against replaying the moves
+    n: int = 12
+    towers: List[List[int]] = [list(range(n, 0, -1)), [], []]
+    for k, (disc, source, target) in enumerate(hanoi_moves(n), 1):
+        assert towers[source].pop() == disc
+        towers[target].append(disc)
+        assert hanoi_state(n, k) == towers
+    random: Random = Random(0)
+    positions: List[int] = [random.randrange(2 ** 64) for _ in range(10_000)]
+    began = perf_counter()
+    for k in positions:
+        hanoi_state(64, k)
+    print(f"hanoi_state(64, k) for {len(positions)} random k: "
+          f"{(perf_counter() - began) / len(positions) * 1e6:.1f}us each")
+    print(f"first moves of 64 discs: {list(islice(hanoi_moves(64), 4))}")
+    for pegs in (3, 4, 5, 6):
+        began = perf_counter()
+        moves, _ = frame_stewart(64, pegs)
+        table: float = perf_counter() - began
+        line: str = f"{pegs} pegs, 64 discs: {moves} moves, table in " \
+            f"{table * 1e3:.2f}ms"
+        if moves < 10 ** 6:
+            began = perf_counter()
+            order = (0, pegs - 1) + tuple(range(1, pegs - 1))
+            assert sum(1 for _ in frame_stewart_moves(64, order)) == moves
+            line += f", streamed in {perf_counter() - began:.3f}s"
+        print(line)
@@ -0,0 +1,58 @@
+"""
+Jump Point Search against BFS, A* and the index-based grid A* on random
+mazes. Every JPS path is checked to be a valid path as short as the BFS one.
+
+Run from the repository root: python -m benchmarks.maze_jps
+"""
+import random
+from time import perf_counter
+from typing import Callable, Dict, List, Optional
+from generic_funcs.generic_search import astar, bfs, node_to_path, Node
+from maze import Maze, MazeLocation, manhattan_distance
+
+
+def check(mazes: int) -> None:
+    rng: random.Random = random.Random(0)
+    for _ in range(mazes):
+        rows, columns = rng.randint(1, 30), rng.randint(1, 30)
+        random.seed(rng.random())
+        m: Maze = Maze(rows, columns, rng.choice([0.1, 0.2, 0.3, 0.4]),
+                       MazeLocation(rng.randrange(rows), rng.randrange(columns)),
+                       MazeLocation(rng.randrange(rows), rng.randrange(columns)))
+        expected: Optional[Node[MazeLocation]] = bfs(m.start, m.goal_test,
+                                                     m.successors)
+        found: Optional[Node[MazeLocation]] = m.jump_point_search()
+        assert (expected is None) == (found is None)
+        if found is not None:
+            path: List[MazeLocation] = node_to_path(found)
+            assert len(path) == len(node_to_path(expected))
+            assert path[0] == m.start and path[-1] == m.goal
+            for here, there in zip(path, path[1:]):
+                assert there in m.successors(here)
+    print(f"JPS matched BFS path lengths on {mazes} random mazes")
+
+
+def run(size: int, sparseness: float) -> None:
+    random.seed(1)
+    m: Maze = Maze(size, size, sparseness, MazeLocation(0, 0),
+                   MazeLocation(size - 1, size - 1))
+    solvers: Dict[str, Callable[[], Optional[Node[MazeLocation]]]] = {
+        "A*": lambda: astar(m.start, m.goal_test, m.successors,
+                            manhattan_distance(m.goal)),
+        "grid A*": m.grid_astar,
+        "JPS": m.jump_point_search,
+    }
+    print(f"{size}x{size}, sparseness {sparseness}")
+    for name, solve in solvers.items():
+        began: float = perf_counter()
+        solution: Optional[Node[MazeLocation]] = solve()
+        elapsed: float = perf_counter() - began
+        length: int = 0 if solution is None else len(node_to_path(solution))
+        print(f"  {name:<8} {elapsed:8.3f}s  path length {length}")
+
+
+if __name__ == "__main__":
+    check(2000)
+    for maze_size in (200, 500):
+        for maze_sparseness in (0.0, 0.1, 0.2):
+            run(maze_size, maze_sparseness)
@@ -0,0 +1,83 @@
+"""
+Landmark (ALT) preprocessing and cached queries on one Maze: preprocessing
+time, A* expansions and time with the Manhattan and landmark heuristics,
+and repeated lookups served from the LRU cache.
+
+Run from the repository root: python -m benchmarks.maze_landmarks
+"""
+import random
+from time import perf_counter
+from typing import Callable, List, Tuple
+from generic_funcs.generic_search import astar
+from maze import Maze, MazeLocation, LandmarkIndex, manhattan_distance
+
+Query = Tuple[MazeLocation, MazeLocation]
+
+
+def connected_cells(m: Maze,
+                    count: int,
+                    rng: random.Random
+                    ) -> List[MazeLocation]:
+    # cells reachable from the maze start, so that every query has a path
+    reachable: List[MazeLocation] = [m.start]
+    seen = {m.start}
+    for ml in reachable:
+        for child in m.successors(ml):
+            if child not in seen:
+                seen.add(child)
+                reachable.append(child)
+    return [rng.choice(reachable) for _ in range(count)]
+
+
+def solve_all(m: Maze,
+              queries: List[Query],
+              heuristic: Callable[[MazeLocation],
+                                  Callable[[MazeLocation], float]]
+              ) -> Tuple[int, float]:
+    expansions: List[int] = [0]
+
+    def successors(ml: MazeLocation) -> List[MazeLocation]:
+        expansions[0] += 1
+        return m.successors(ml)
+
+    began: float = perf_counter()
+    for start, goal in queries:
+        astar(start, goal.__eq__, successors, heuristic(goal))
+    return expansions[0], perf_counter() - began
+
+
+def run(size: int, landmarks: int, queries: int) -> None:
+    random.seed(0)
+    m: Maze = Maze(size, size, 0.2, MazeLocation(0, 0),
+                   MazeLocation(size - 1, size - 1))
+    rng: random.Random = random.Random(1)
+    cells: List[MazeLocation] = connected_cells(m, 2 * queries, rng)
+    pairs: List[Query] = list(zip(cells[::2], cells[1::2]))
+    print(f"{size}x{size} maze, {landmarks} landmarks, {queries} queries")
+
+    began: float = perf_counter()
+    index: LandmarkIndex = LandmarkIndex(m, landmarks, cache_size=queries)
+    print(f"  preprocessing          {perf_counter() - began:8.3f}s")
+
+    for name, heuristic in (("Manhattan", manhattan_distance),
+                            ("landmarks", index.heuristic)):
+        expanded, elapsed = solve_all(m, pairs, heuristic)
+        print(f"  A* {name:<10} {expanded:>10} expansions "
+              f"{elapsed:8.3f}s")
+
+    began = perf_counter()
+    for start, goal in pairs:
+        index.path(start, goal)
+    cold: float = perf_counter() - began
+    began = perf_counter()
+    for start, goal in pairs:
+        index.path(start, goal)
+    warm: float = perf_counter() - began
+    print(f"  path() cold            {cold:8.3f}s")
+    print(f"  path() cached          {warm:8.6f}s "
+          f"({index.hits} hits, {index.misses} misses)")
+
+
+if __name__ == "__main__":
+    run(100, 8, 200)
+    run(300, 8, 100)
@@ -0,0 +1,61 @@
+"""
+All occurrences of many motifs in one MotifMatcher pass against scanning
+for each motif with str.find, on a random megabase sequence, plus the same
+pass streamed from a MappedGene file.
+
+Run from the repository root: python -m benchmarks.motif_matcher
+"""
+import itertools
+import os
+import random
+import tempfile
+from time import perf_counter
+from typing import List, Tuple
+from compressedGene import MappedGene, PackedGeneWriter
+from dna_search import MotifMatcher, MotifMatches, gene_chunks
+from benchmarks.gene_index import scan
+
+
+def pairs(matches: MotifMatches) -> List[Tuple[int, int]]:
+    return sorted(zip(matches.pattern_ids, matches.positions))
+
+
+def run(length: int, motifs: int) -> None:
+    rng: random.Random = random.Random(length)
+    sequence: str = "".join(rng.choices("ACGT", k=length))
+    patterns: List[str] = ["".join(codon) for codon
+                           in itertools.product("ACGT", repeat=3)]
+    while len(patterns) < motifs:
+        start: int = rng.randrange(length - 20)
+        patterns.append(sequence[start:start + rng.randrange(6, 20)])
+    print(f"{length} bases, {len(patterns)} motifs")
+
+    began: float = perf_counter()
+    expected: List[Tuple[int, int]] = sorted(
+        (pattern_id, position) for pattern_id, pattern in enumerate(patterns)
+        for position in scan(sequence, pattern))
+    print(f"  str.find per motif: {perf_counter() - began:.2f}s, "
+          f"{len(expected)} matches")
+
+    began = perf_counter()
+    matcher: MotifMatcher = MotifMatcher(patterns)
+    built: float = perf_counter() - began
+    began = perf_counter()
+    assert pairs(matcher.search([sequence])) == expected
+    print(f"  MotifMatcher: built in {built:.2f}s, "
+          f"one pass in {perf_counter() - began:.2f}s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, "gene.pgen")
+        with PackedGeneWriter(path) as writer:
+            writer.write(sequence)
+        with MappedGene(path) as gene:
+            began = perf_counter()
+            assert pairs(matcher.search(gene_chunks(gene))) == expected
+            print(f"  MotifMatcher over MappedGene chunks: "
+                  f"{perf_counter() - began:.2f}s")
+
+
+if __name__ == "__main__":
+    run(1_000_000, 100)
+    run(1_000_000, 1000)
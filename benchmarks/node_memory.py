@@ -0,0 +1,93 @@
+"""
+Per-node memory and allocation time, measured with tracemalloc, of the
+previous dict-backed Node class, the slotted Node and NodeArena entries,
+followed by the peak memory of a whole BFS with each representation.
+
+Run from the repository root: python -m benchmarks.node_memory
+"""
+import random
+import tracemalloc
+from time import perf_counter
+from typing import Callable, List, Optional, Set, Tuple
+from generic_funcs.generic_search import \
+    Node, \
+    NodeArena, \
+    Queue, \
+    bfs, \
+    node_to_path
+from maze import Maze, MazeLocation
+
+
+class DictNode:
+    # the Node class as it was before __slots__
+    def __init__(self, state, parent, cost: float = 0.0,
+                 heuristic: float = 0.0) -> None:
+        self.state = state
+        self.parent = parent
+        self.cost = cost
+        self.heuristic = heuristic
+
+
+def measure(build: Callable[[], object]) -> Tuple[float, int]:
+    tracemalloc.start()
+    began: float = perf_counter()
+    kept: object = build()
+    elapsed: float = perf_counter() - began
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return elapsed, peak
+
+
+def chain(node_class: type, count: int) -> object:
+    node = None
+    for state in range(count):
+        node = node_class(state, node, 1.0)
+    return node
+
+
+def arena(count: int) -> NodeArena[int]:
+    nodes: NodeArena[int] = NodeArena()
+    for state in range(count):
+        nodes.add(state, state - 1, 1.0)
+    return nodes
+
+
+def legacy_bfs(initial: MazeLocation,
+               goal_test: Callable[[MazeLocation], bool],
+               successors: Callable[[MazeLocation], List[MazeLocation]]
+               ) -> Optional[DictNode]:
+    # the previous bfs, one DictNode per reached state
+    frontier: Queue[DictNode] = Queue()
+    frontier.push(DictNode(initial, None))
+    explored: Set[MazeLocation] = {initial}
+    while not frontier.empty:
+        current_node: DictNode = frontier.pop()
+        if goal_test(current_node.state):
+            return current_node
+        for child in successors(current_node.state):
+            if child in explored:
+                continue
+            explored.add(child)
+            frontier.push(DictNode(child, current_node))
+    return None
+
+
+if __name__ == "__main__":
+    count: int = 200_000
+    # the states themselves are small ints shared by all three
+    for name, build in (("dict Node", lambda: chain(DictNode, count)),
+                        ("slotted Node", lambda: chain(Node, count)),
+                        ("NodeArena", lambda: arena(count))):
+        elapsed, peak = measure(build)
+        print(f"{name:<13} {peak / count:6.1f} bytes/node "
+              f"{elapsed / count * 1e9:7.0f} ns/node")
+
+    random.seed(0)
+    m: Maze = Maze(400, 400, 0.0, MazeLocation(0, 0), MazeLocation(399, 399))
+    for name, search in (("BFS, dict Node", legacy_bfs),
+                         ("BFS, NodeArena", bfs)):
+        elapsed, peak = measure(lambda: search(m.start, m.goal_test,
+                                               m.successors))
+        print(f"{name:<15} peak {peak / 2 ** 20:6.1f} MiB, {elapsed:.2f}s")
+    assert len(node_to_path(bfs(m.start, m.goal_test, m.successors))) == 799
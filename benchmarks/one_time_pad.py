@@ -0,0 +1,60 @@
+"""
+Throughput of the streaming one-time pad on files, against copying the
+file and against the str/int encrypt and decrypt, with the peak memory
+of each.
+
+Run from the repository root: python -m benchmarks.one_time_pad
+"""
+import filecmp
+import os
+import shutil
+import tempfile
+import tracemalloc
+from time import perf_counter
+from typing import Callable
+from unbreakableEncryption import decrypt, decrypt_file, encrypt, encrypt_file
+
+
+def measure(name: str, size: int, function: Callable[[], object]) -> None:
+    tracemalloc.start()
+    began: float = perf_counter()
+    function()
+    elapsed: float = perf_counter() - began
+    peak: int = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"  {name:<28} {size / elapsed / 2 ** 20:8.1f}MB/s, "
+          f"peak {peak / 2 ** 20:6.2f}MB")
+
+
+def run(megabytes: int) -> None:
+    size: int = megabytes << 20
+    print(f"{megabytes}MB")
+    with tempfile.TemporaryDirectory() as directory:
+        plain: str = os.path.join(directory, "plain")
+        with open(plain, "wb") as file:
+            for _ in range(megabytes):
+                file.write(os.urandom(1 << 20))
+        encrypted: str = os.path.join(directory, "encrypted")
+        key: str = os.path.join(directory, "key")
+        decrypted: str = os.path.join(directory, "decrypted")
+        measure("copy", size, lambda: shutil.copyfile(
+            plain, os.path.join(directory, "copy")))
+        measure("encrypt_file", size,
+                lambda: encrypt_file(plain, encrypted, key))
+        measure("decrypt_file", size,
+                lambda: decrypt_file(encrypted, key, decrypted))
+        assert filecmp.cmp(plain, decrypted, shallow=False)
+
+
+def previous(megabytes: int) -> None:
+    text: str = "x" * (megabytes << 20)
+    print(f"{megabytes}MB of text with encrypt/decrypt")
+    keys = []
+    measure("encrypt", len(text), lambda: keys.append(encrypt(text)))
+    measure("decrypt", len(text), lambda: decrypt(*keys[0]))
+
+
+if __name__ == "__main__":
+    previous(16)
+    run(16)
+    run(256)
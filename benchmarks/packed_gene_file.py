@@ -0,0 +1,72 @@
+"""
+Streaming a synthetic FASTA genome with N runs into packed gene files,
+reopening them with MappedGene and reading random bases and slices,
+checked against the sequence kept aside while generating it.
+
+Run from the repository root: python -m benchmarks.packed_gene_file
+"""
+import os
+import random
+import tempfile
+from time import perf_counter
+from typing import List
+from compressedGene import MappedGene, pack_fasta
+
+
+def write_fasta(path: str, records: int, length: int, seed: int) -> List[str]:
+    rng: random.Random = random.Random(seed)
+    sequences: List[str] = []
+    with open(path, "w") as fasta:
+        for record in range(records):
+            pieces: List[str] = []
+            while sum(map(len, pieces)) < length:
+                pieces.append("".join(rng.choices("ACGTacgt",
+                                                  k=rng.randrange(1, 50000))))
+                pieces.append("N" * rng.randrange(0, 5000))
+            sequence: str = "".join(pieces)[:length]
+            sequences.append(sequence.upper())
+            fasta.write(f">chr{record + 1} synthetic\n")
+            for start in range(0, len(sequence), 60):
+                fasta.write(sequence[start:start + 60] + "\n")
+    return sequences
+
+
+def run(records: int, length: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        fasta_path: str = os.path.join(directory, "genome.fa")
+        sequences: List[str] = write_fasta(fasta_path, records, length, 0)
+        fasta_size: int = os.path.getsize(fasta_path)
+        began: float = perf_counter()
+        with open(fasta_path) as fasta:
+            paths: List[str] = pack_fasta(fasta, directory)
+        packed: float = perf_counter() - began
+        packed_size: int = sum(map(os.path.getsize, paths))
+        print(f"{records} x {length} bases: FASTA {fasta_size >> 20}MB "
+              f"packed in {packed:.2f}s to {packed_size >> 20}MB")
+
+        rng: random.Random = random.Random(1)
+        began = perf_counter()
+        genes: List[MappedGene] = [MappedGene(path) for path in paths]
+        print(f"  opened in {(perf_counter() - began) * 1e3:.2f}ms")
+        began = perf_counter()
+        for _ in range(100_000):
+            record: int = rng.randrange(records)
+            i: int = rng.randrange(length)
+            assert genes[record][i] == sequences[record][i]
+        print(f"  random bases: "
+              f"{(perf_counter() - began) / 100_000 * 1e9:.0f}ns each")
+        began = perf_counter()
+        for _ in range(1000):
+            record = rng.randrange(records)
+            i = rng.randrange(length)
+            assert genes[record][i:i + 10_000] == \
+                sequences[record][i:i + 10_000]
+        print(f"  10kb slices: "
+              f"{(perf_counter() - began) / 1000 * 1e6:.0f}us each")
+        for gene in genes:
+            gene.close()
+
+
+if __name__ == "__main__":
+    run(3, 2_000_000)
+    run(1, 20_000_000)
@@ -0,0 +1,78 @@
+"""
+Cost of sma_star's evictions as its budget grows. The goal of the 30x30
+maze cannot be reached, so once memory is full every new Node forgets
+another. Heap pops per expansion must stay flat across budgets rather
+than grow with max_nodes; the search is cut off after a fixed number of
+expansions. Also checks that the budget holds and that paths are
+optimal when they fit.
+
+Run from the repository root: python -m benchmarks.sma_star
+"""
+from heapq import heappop
+from time import perf_counter
+from typing import Callable, List
+from unittest import mock
+from generic_funcs import generic_search
+from generic_funcs.generic_search import astar, bfs, sma_star
+from maze import Maze, MazeLocation, manhattan_distance
+
+EXPANSIONS = 20_000  # after which a search is cut off
+POPS_PER_EXPANSION = 8  # generous bound; rescanning the tree costs hundreds
+
+
+class _CutOff(Exception):
+    pass
+
+
+def capped(successors: Callable[[MazeLocation], List[MazeLocation]]) \
+        -> Callable[[MazeLocation], List[MazeLocation]]:
+    expanded: List[int] = [0]
+
+    def _successors(location: MazeLocation) -> List[MazeLocation]:
+        expanded[0] += 1
+        if expanded[0] > EXPANSIONS:
+            raise _CutOff
+        return successors(location)
+    return _successors
+
+
+def evictions(budgets: List[int]) -> None:
+    maze: Maze = Maze(30, 30, 0.3, goal=MazeLocation(29, 29), seed=7)
+    assert bfs(maze.start, maze.goal_test, maze.successors) is None
+    for max_nodes in budgets:
+        # wraps only counts the calls, heappop still does the work
+        with mock.patch.object(generic_search, "heappop",
+                               wraps=heappop) as pops:
+            began: float = perf_counter()
+            try:
+                sma_star(maze.start, maze.goal_test, capped(maze.successors),
+                         manhattan_distance(maze.goal), max_nodes)
+            except _CutOff:
+                pass
+            elapsed: float = perf_counter() - began
+        print(f"max_nodes {max_nodes:>5}: {EXPANSIONS} expansions in "
+              f"{elapsed:.2f}s, {pops.call_count / EXPANSIONS:.1f} heap pops "
+              f"each")
+        assert pops.call_count <= POPS_PER_EXPANSION * EXPANSIONS
+
+
+def budgets_and_paths(seeds: int) -> None:
+    for seed in range(seeds):
+        maze: Maze = Maze(7, 7, 0.25, goal=MazeLocation(6, 6), seed=seed)
+        shortest = astar(maze.start, maze.goal_test, maze.successors,
+                         manhattan_distance(maze.goal))
+        for max_nodes in (1, 2, 4, 8, 40):
+            node, stats = sma_star(maze.start, maze.goal_test,
+                                   maze.successors,
+                                   manhattan_distance(maze.goal), max_nodes)
+            assert stats.peak_nodes <= max_nodes
+            if node is not None:
+                assert shortest is not None and node.cost >= shortest.cost
+            if max_nodes == 40 and shortest is not None:
+                assert node is not None and node.cost == shortest.cost
+    print(f"{seeds} 7x7 mazes: budgets held, paths optimal when they fit")
+
+
+if __name__ == "__main__":
+    evictions([250, 1000, 4000])
+    budgets_and_paths(16)
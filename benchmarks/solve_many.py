@@ -0,0 +1,49 @@
+"""
+Throughput of solve_many on a batch of seeded mazes for growing worker
+counts, checked against solving the same batch in this process.
+
+Run from the repository root: python -m benchmarks.solve_many
+"""
+from os import cpu_count
+from time import perf_counter
+from typing import Dict, List, Optional
+from generic_funcs.generic_search import \
+    astar, \
+    bfs, \
+    node_to_path, \
+    solve_many
+from maze import MazeLocation, MazeProblem
+from missionaries import MCProblem
+
+
+def run(count: int, size: int) -> None:
+    problems: List[MazeProblem] = [MazeProblem(size, size, 0.2, seed,
+                                               with_heuristic=True)
+                                   for seed in range(count)]
+    began: float = perf_counter()
+    expected: Dict[int, Optional[List[MazeLocation]]] = {}
+    for index, problem in enumerate(problems):
+        solution = astar(*problem())
+        expected[index] = None if solution is None else node_to_path(solution)
+    serial: float = perf_counter() - began
+    print(f"{count} mazes of {size}x{size}, in process: {serial:.2f}s "
+          f"({count / serial:.0f} problems/s)")
+
+    workers: int = 1
+    while workers <= (cpu_count() or 1):
+        began = perf_counter()
+        results: Dict[int, Optional[List[MazeLocation]]] = \
+            dict(solve_many(problems, astar, workers=workers, chunksize=16))
+        elapsed: float = perf_counter() - began
+        assert results == expected
+        print(f"  {workers:>3} workers: {elapsed:.2f}s "
+              f"({count / elapsed:.0f} problems/s, "
+              f"speedup {serial / elapsed:.2f}x)")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    run(400, 60)
+    run(100, 200)
+    for _, path in solve_many([MCProblem(3)], bfs, workers=1):
+        print(f"missionaries: {len(path) - 1} crossings")
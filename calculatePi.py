@@ -1,14 +1,75 @@
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Context, Decimal
+from itertools import repeat
+from math import fsum
+from operator import mul, truediv
+from os import cpu_count
+from typing import List, Optional
+
+
+def leibniz_sum(start: int, stop: int) -> float:
+    """
+    The sum of the Leibniz terms 4 * (-1)^k / (2k + 1) for k from start
+    to stop. Each pair of terms is folded into one, 8 / ((2k + 1)(2k + 3)),
+    and fsum adds them without losing anything beyond the rounding of each
+    term. The loop is made of map and range so that it runs in C.
+    """
+    # pairs starting on an odd k are negative
+    numerator: float = -8.0 if start % 2 else 8.0
+    end: int = start + 2 * (max(0, stop - start) // 2)
+    total: float = fsum(map(truediv, repeat(numerator),
+                            map(mul, range(2 * start + 1, 2 * end + 1, 4),
+                                range(2 * start + 3, 2 * end + 3, 4))))
+    if end < stop:
+        # the term left without a partner
+        total = fsum([total, (-4.0 if end % 2 else 4.0) / (2 * end + 1)])
+    return total
+
+
 def calculate_pi(n_terms: int) -> float:
-    numerator: float=4.0
-    denominator: float=1.0
-    operation: float=1.0
-    pi: float = 0.0
+    return leibniz_sum(0, n_terms)
+
+
+def calculate_pi_parallel(n_terms: int,
+                          workers: Optional[int] = None,
+                          chunks: Optional[int] = None) -> float:
+    """calculate_pi with the terms split in chunks across processes"""
+    workers = workers or cpu_count() or 1
+    chunks = chunks or 4 * workers
+    bounds: List[int] = [n_terms * i // chunks for i in range(chunks + 1)]
+    with ProcessPoolExecutor(workers) as executor:
+        return fsum(executor.map(leibniz_sum, bounds, bounds[1:]))
+
+
+def _arccot(x: int, unity: int) -> int:
+    # arccot(x) = 1/x - 1/(3x^3) + 1/(5x^5) - ..., scaled by unity
+    total: int = unity // x
+    power: int = total
+    x_squared: int = x * x
+    n: int = 3
+    sign: int = -1
+    while power:
+        power //= x_squared
+        total += sign * (power // n)
+        sign = -sign
+        n += 2
+    return total
+
+
+def machin_pi(digits: int) -> Decimal:
+    """
+    pi truncated to digits decimal places with Machin's formula,
+    pi = 16 arccot(5) - 4 arccot(239), which gains about 1.4 digits per
+    term where the Leibniz series needs ten times the terms per digit.
+    """
+    guard: int = 10  # extra digits absorbing the truncation of each term
+    unity: int = 10 ** (digits + guard)
+    pi: int = 4 * (4 * _arccot(5, unity) - _arccot(239, unity))
+    # with enough precision for every digit, scaling does not round
+    return Decimal(pi // 10 ** guard).scaleb(-digits,
+                                             Context(prec=digits + 1))
 
-    for _ in range(n_terms): 
-        pi += operation * (numerator / denominator)
-        denominator += 2.0
-        operation *= -1
-    return pi
 
 if __name__ == "__main__":
     print(calculate_pi(1000000))
+    print(machin_pi(50))
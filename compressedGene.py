@@ -1,51 +1,341 @@
+import mmap
+import os
+import re
+import sys
+from array import array
+from bisect import bisect_right
+from struct import Struct
+from typing import BinaryIO, List, Optional, TextIO, Union
+
+# nucleotides take 2 bits each, four to a byte with the first one in the
+# high bits: A = 0b00, C = 0b01, G = 0b10, T = 0b11
+_NUCLEOTIDES: str = "ACGT"
+_INVALID: int = 4
+# ascii byte -> 2 bit code, or _INVALID
+_ENCODE: bytes = bytes(_NUCLEOTIDES.index(chr(b))
+                       if chr(b) in _NUCLEOTIDES else _INVALID
+                       for b in range(256))
+# packed byte -> the four nucleotides in it
+_DECODE: List[bytes] = ["".join(_NUCLEOTIDES[b >> shift & 0b11]
+                                for shift in (6, 4, 2, 0)).encode("ascii")
+                        for b in range(256)]
+
+
+def _pack(codes: bytes) -> bytearray:
+    # codes holds one 2 bit code per byte. every four bytes are folded into
+    # one with shifts and masks on a single int, so the loop runs in C over
+    # the whole sequence at once
+    codes += bytes(-len(codes) % 4)
+    size: int = len(codes)
+    if size == 0:
+        return bytearray()
+    value: int = int.from_bytes(codes, "big")
+    # 0000 00aa 0000 00bb -> 0000 0000 0000 aabb
+    value = (value | value >> 6) & \
+        int.from_bytes(b"\x00\x0f" * (size // 2), "big")
+    # 0000 aabb 0000 ccdd (as 16 bit halves) -> 0000 0000 aabb ccdd
+    value = (value | value >> 12) & \
+        int.from_bytes(b"\x00\x00\x00\xff" * (size // 4), "big")
+    return bytearray(value.to_bytes(size, "big")[3::4])
+
+
+# packed gene files: a header, the packed nucleotides, then a table of the
+# runs of other symbols (N and the like), each stored as A in the payload:
+# the run starts and lengths as little-endian uint64 and one byte per run
+# for the symbol
+_MAGIC: bytes = b"PGEN"
+_VERSION: int = 1
+_HEADER: Struct = Struct("<4sB3xQQ")  # magic, version, length, runs
+_RUN_FIELD: str = "Q"
+# a run of one symbol other than A, C, G and T
+_EXCEPTION_RUN = re.compile(rb"([^ACGT])\1*")
+
+
+def _write_header(file: BinaryIO, length: int, runs: int) -> None:
+    file.seek(0)
+    file.write(_HEADER.pack(_MAGIC, _VERSION, length, runs))
+
+
 class CompressedGene:
     def __init__(self, gene: str) -> None:
         self._compress(gene)
 
     def _compress(self, gene: str) -> None:
-        self.bit_string : int = 1  #start with a sentinel
-        for nucleotide in gene.upper():
-            """AAT = 0b1000011"""
-
-            self.bit_string <<= 2  #shift left two bits
-            if nucleotide == "A":
-                self.bit_string |= 0b00  
-            elif nucleotide == "C":
-                self.bit_string |= 0b01  
-            elif nucleotide == "G":
-                self.bit_string |= 0b10
-            elif nucleotide == "T":
-                self.bit_string |= 0b11
-            else:
-                raise ValueError("Invalid Nucleotide: {}".format(nucleotide))
-    
+        gene = gene.upper()
+        try:
+            codes: bytes = gene.encode("ascii").translate(_ENCODE)
+        except UnicodeEncodeError as error:
+            raise ValueError("Invalid Nucleotide: {}"
+                             .format(gene[error.start])) from None
+        invalid: int = codes.find(_INVALID)
+        if invalid != -1:
+            raise ValueError("Invalid Nucleotide: {}".format(gene[invalid]))
+        self._length: int = len(gene)
+        self._packed: bytearray = _pack(codes)
+
+    @classmethod
+    def _from_packed(cls, packed: bytearray, length: int) -> "CompressedGene":
+        gene: CompressedGene = cls.__new__(cls)
+        gene._length = length
+        gene._packed = packed
+        return gene
+
+    @property
+    def bit_string(self) -> int:
+        """The nucleotides as one int after a 1 sentinel, AAT = 0b1000011"""
+        padding: int = 2 * (-self._length % 4)
+        return 1 << 2 * self._length | \
+            int.from_bytes(self._packed, "big") >> padding
+
     def decompress(self) -> str:
-        gene: str = ""
-        for i in range(0, self.bit_string.bit_length() -1, 2): # - 1 to exclude sentinel
-            bits: int = self.bit_string >> i & 0b11 #gets two relevant bits
-            if bits == 0b00:
-                gene += "A"
-            elif bits == 0b01:
-                gene += "C"
-            elif bits == 0b10:
-                gene += "G"
-            elif bits == 0b11:
-                gene += "T"
-            else: 
-                raise ValueError("Invalid bits: {}".format(bits))
-        return gene[::-1]  #reverses string by slicing backward
+        return b"".join(map(_DECODE.__getitem__, self._packed))[
+            :self._length].decode("ascii")
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: Union[int, slice]) \
+            -> Union[str, "CompressedGene"]:
+        """A nucleotide, or a slice as another CompressedGene"""
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step == 1:
+                return self._slice(start, stop)
+            return CompressedGene("".join(self[i]
+                                          for i in range(start, stop, step)))
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("CompressedGene index out of range")
+        return _NUCLEOTIDES[self._packed[index >> 2]
+                            >> 6 - 2 * (index & 3) & 0b11]
+
+    def _slice(self, start: int, stop: int) -> "CompressedGene":
+        # shift the bytes covering the slice so it starts on a byte boundary
+        length: int = max(0, stop - start)
+        chunk: bytearray = self._packed[start >> 2:(stop + 3) >> 2]
+        bits: int = 8 * len(chunk)
+        value: int = (int.from_bytes(chunk, "big") << 2 * (start & 3)) & \
+            ((1 << bits) - 1)
+        packed: bytearray = bytearray(
+            value.to_bytes(len(chunk), "big")[:(length + 3) >> 2])
+        if length & 3:
+            # clear what follows the last nucleotide
+            packed[-1] &= 0xff << 8 - 2 * (length & 3) & 0xff
+        return CompressedGene._from_packed(packed, length)
 
     def __str__(self) -> str:
         """String representation for pretty printing"""
-        return self.decompress() 
+        return self.decompress()
+
+    def save(self, path: str) -> None:
+        """Writes a packed gene file, which MappedGene opens"""
+        with open(path, "wb") as file:
+            _write_header(file, self._length, 0)
+            file.write(self._packed)
+
+
+class PackedGeneWriter:
+    """
+    Writes a packed gene file from a sequence given in pieces, so it never
+    needs to be in memory as a whole. Unlike CompressedGene, symbols other
+    than A, C, G and T are accepted and kept in the exception table.
+    Lower case is stored as upper case.
+    """
+    def __init__(self, path: str) -> None:
+        self._file: BinaryIO = open(path, "wb")
+        _write_header(self._file, 0, 0)
+        self._length: int = 0
+        self._carry: bytes = b""  # codes not yet filling a byte
+        self._starts: array = array(_RUN_FIELD)
+        self._lengths: array = array(_RUN_FIELD)
+        self._symbols: bytearray = bytearray()
+
+    def write(self, sequence: str) -> None:
+        try:
+            raw: bytes = sequence.upper().encode("ascii")
+        except UnicodeEncodeError as error:
+            raise ValueError("Invalid Nucleotide: {}"
+                             .format(sequence[error.start])) from None
+        codes: bytes = raw.translate(_ENCODE)
+        if _INVALID in codes:
+            for run in _EXCEPTION_RUN.finditer(raw):
+                self._add_run(self._length + run.start(),
+                              run.end() - run.start(), raw[run.start()])
+            codes = codes.replace(bytes([_INVALID]), b"\x00")
+        codes = self._carry + codes
+        whole: int = len(codes) - len(codes) % 4
+        self._file.write(_pack(codes[:whole]))
+        self._carry = codes[whole:]
+        self._length += len(raw)
+
+    def _add_run(self, start: int, length: int, symbol: int) -> None:
+        # a run carrying on from the previous piece extends it
+        if self._symbols and self._symbols[-1] == symbol and \
+                self._starts[-1] + self._lengths[-1] == start:
+            self._lengths[-1] += length
+        else:
+            self._starts.append(start)
+            self._lengths.append(length)
+            self._symbols.append(symbol)
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self._file.write(_pack(self._carry))
+        self._carry = b""
+        if sys.byteorder == "big":
+            self._starts.byteswap()
+            self._lengths.byteswap()
+        self._file.write(self._starts.tobytes())
+        self._file.write(self._lengths.tobytes())
+        self._file.write(self._symbols)
+        _write_header(self._file, self._length, len(self._symbols))
+        self._file.close()
+
+    def __enter__(self) -> "PackedGeneWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _fasta_name(header: str) -> str:
+    # the identifier of a record, usable as a file name
+    words: List[str] = header[1:].split()
+    return re.sub(r"[^\w.-]", "_", words[0]) if words else "sequence"
+
+
+def pack_fasta(source: TextIO,
+               directory: str,
+               buffer_size: int = 1 << 20) -> List[str]:
+    """
+    Streams a FASTA file into one packed gene file per record, named after
+    the record, in directory. Lines are gathered into pieces of about
+    buffer_size bases. Returns the paths written.
+    """
+    paths: List[str] = []
+    writer: Optional[PackedGeneWriter] = None
+    pending: List[str] = []
+    buffered: int = 0
+    try:
+        for line in source:
+            line = line.strip()
+            if line.startswith(">"):
+                if writer is not None:
+                    writer.write("".join(pending))
+                    writer.close()
+                pending, buffered = [], 0
+                paths.append(os.path.join(directory,
+                                          _fasta_name(line) + ".pgen"))
+                writer = PackedGeneWriter(paths[-1])
+            elif line and not line.startswith(";"):
+                if writer is None:
+                    raise ValueError("FASTA sequence before any header")
+                pending.append(line)
+                buffered += len(line)
+                if buffered >= buffer_size:
+                    writer.write("".join(pending))
+                    pending, buffered = [], 0
+        if writer is not None:
+            writer.write("".join(pending))
+    finally:
+        if writer is not None:
+            writer.close()
+    return paths
+
+
+class MappedGene:
+    """
+    A packed gene file opened with mmap: opening it reads only the header
+    and the exception table, and bases and slices are decoded from the
+    mapped pages they sit in.
+    """
+    def __init__(self, path: str) -> None:
+        self._file: BinaryIO = open(path, "rb")
+        self._map: mmap.mmap = mmap.mmap(self._file.fileno(), 0,
+                                         access=mmap.ACCESS_READ)
+        magic, version, length, runs = _HEADER.unpack_from(self._map)
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise ValueError("Not a packed gene file: {}".format(path))
+        self._length: int = length
+        end: int = _HEADER.size + (length + 3) // 4
+        self._payload: memoryview = memoryview(self._map)[_HEADER.size:end]
+        self._starts: array = array(_RUN_FIELD)
+        self._starts.frombytes(self._map[end:end + 8 * runs])
+        lengths: array = array(_RUN_FIELD)
+        lengths.frombytes(self._map[end + 8 * runs:end + 16 * runs])
+        if sys.byteorder == "big":
+            self._starts.byteswap()
+            lengths.byteswap()
+        self._ends: array = array(_RUN_FIELD,
+                                  (start + run for start, run
+                                   in zip(self._starts, lengths)))
+        self._symbols: bytes = self._map[end + 16 * runs:end + 17 * runs]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: Union[int, slice]) -> str:
+        """A base, or a slice as a str"""
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step == 1:
+                return self._slice(start, stop)
+            return "".join(self[i] for i in range(start, stop, step))
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("MappedGene index out of range")
+        run: int = bisect_right(self._starts, index) - 1
+        if run >= 0 and index < self._ends[run]:
+            return chr(self._symbols[run])
+        return _NUCLEOTIDES[self._payload[index >> 2]
+                            >> 6 - 2 * (index & 3) & 0b11]
+
+    def _slice(self, start: int, stop: int) -> str:
+        if start >= stop:
+            return ""
+        first: int = start >> 2
+        bases: bytearray = bytearray(b"".join(map(
+            _DECODE.__getitem__, self._payload[first:(stop + 3) >> 2]))[
+            start - 4 * first:stop - 4 * first])
+        # put back the runs of other symbols overlapping the slice
+        run: int = bisect_right(self._ends, start)
+        while run < len(self._starts) and self._starts[run] < stop:
+            begin: int = max(self._starts[run], start)
+            end: int = min(self._ends[run], stop)
+            bases[begin - start:end - start] = \
+                bytes([self._symbols[run]]) * (end - begin)
+            run += 1
+        return bases.decode("ascii")
+
+    def decompress(self) -> str:
+        return self._slice(0, self._length)
+
+    def __str__(self) -> str:
+        return self.decompress()
+
+    def close(self) -> None:
+        # the memoryview has to go before the map can be closed
+        if hasattr(self, "_payload"):
+            self._payload.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "MappedGene":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
 
 if __name__ == "__main__":
     from sys import getsizeof
-    original : str = "AATGGCCGAATTGAGCCTGAAGTCAGTTGCAGTAGCTAGAATCATGCCTAGCTAGGATCGATCATGCATGC" * 100
+    original: str = "AATGGCCGAATTGAGCCTGAAGTCAGTTGCAGTAGCTAGAATCATGCCTAGCTAGGATCGATCATGCATGC" * 100
     print(original)
     print("Original size: {} bytes.".format(getsizeof(original)))
-    compressed : CompressedGene = CompressedGene(original)
-    print("Compressed size: {} bytes.".format(getsizeof(compressed.bit_string)))
+    compressed: CompressedGene = CompressedGene(original)
+    print("Compressed size: {} bytes.".format(getsizeof(compressed._packed)))
     print("Original and decompressed are the same: {}.".format(original == compressed.decompress()))
-
-
@@ -1,5 +1,20 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, deque
 from enum import IntEnum
-from typing import Tuple, List
+from itertools import product
+from typing import \
+    Any, \
+    Deque, \
+    Dict, \
+    Iterable, \
+    Iterator, \
+    NamedTuple, \
+    Optional, \
+    Tuple, \
+    List, \
+    Sequence, \
+    Union
 
 # Nucleotide is of type IntEnum because it gives comparison operators
 # such as (<, >=...)
@@ -11,18 +26,79 @@ Gene = List[Condon]
 
 gene_str : str = "ACATGCATGTAGCATCGGCATAACTGACTCGATGAGTAGCATGCATGCAT"
 
+# a codon id is 16 * first + 4 * second + third with A, C, G, T as 0 to 3,
+# so ids run from 0 to 63 in the order tuples of Nucleotide compare in
+_NUCLEOTIDE_CODES: bytes = bytes("ACGT".index(chr(b)) if chr(b) in "ACGT"
+                                 else 255 for b in range(256))
+_TIMES_4: bytes = bytes(b * 4 % 256 for b in range(256))
+_TIMES_16: bytes = bytes(b * 16 % 256 for b in range(256))
+# codon id -> the one tuple every Gene shares for that codon
+_CODONS: List["Condon"] = list(product(Nucleotide, repeat=3))
+# codon id -> its three letters
+_CODON_TEXT: List[str] = ["".join(n.name for n in c) for c in _CODONS]
 
-def string_to_gene(s: str) -> Gene:
-    gene: Gene = []
-    for i in range(0, len(s), 3):
-        if(i+2) >= len(s):
-            return gene
-        # initialize condon out with three nucleotides 
-        condon: Condon = (Nucleotide[s[i]], Nucleotide[s[i + 1]], Nucleotide[s[i + 2]])
-        gene.append(condon)
-    return gene
 
-studied_gene : Gene = string_to_gene(gene_str)
+def codon_id(condon: Condon) -> int:
+    return (condon[0] - 1) * 16 + (condon[1] - 1) * 4 + condon[2] - 1
+
+
+def _ascii(text: str) -> bytes:
+    try:
+        return text.encode("ascii")
+    except UnicodeEncodeError as error:
+        raise ValueError("Invalid Nucleotide: {}"
+                         .format(text[error.start])) from None
+
+
+def _ids_from_text(text: bytes) -> bytes:
+    # like string_to_gene always did, a trailing partial codon is dropped
+    size: int = len(text) // 3
+    codes: bytes = text[:3 * size].upper().translate(_NUCLEOTIDE_CODES)
+    invalid: int = codes.find(255)
+    if invalid != -1:
+        raise ValueError("Invalid Nucleotide: {}"
+                         .format(chr(text[invalid])))
+    if size == 0:
+        return b""
+    # the three parts of each id are added as whole numbers: every byte
+    # stays below 64, so nothing carries into the next one
+    total: int = int.from_bytes(codes[0::3].translate(_TIMES_16), "big") + \
+        int.from_bytes(codes[1::3].translate(_TIMES_4), "big") + \
+        int.from_bytes(codes[2::3], "big")
+    return total.to_bytes(size, "big")
+
+
+def codon_ids(sequence: Any, frame: int = 0, chunk: int = 3 << 16) -> bytes:
+    """
+    The codons of sequence, read from nucleotide offset frame, as one id
+    per byte. sequence is a str, bytes, a Gene, or a packed gene like
+    CompressedGene or MappedGene, which is decoded chunk codons at a time.
+    """
+    if isinstance(sequence, str):
+        return _ids_from_text(_ascii(sequence[frame:]))
+    if isinstance(sequence, (bytes, bytearray)):
+        return _ids_from_text(bytes(sequence[frame:]))
+    if isinstance(sequence, list):
+        ids: bytes = bytes(map(codon_id, sequence))
+        if frame == 0:
+            return ids
+        # other frames cut across codons, so they are read from the letters
+        return _ids_from_text(
+            "".join(map(_CODON_TEXT.__getitem__, ids))[frame:].encode())
+    chunk -= chunk % 3
+    return b"".join(
+        _ids_from_text(_ascii(str(sequence[start:start + chunk])))
+        for start in range(frame, len(sequence), chunk))
+
+
+def reading_frames(sequence: Any) -> List[bytes]:
+    """The codon ids of the three forward reading frames"""
+    return [codon_ids(sequence, frame) for frame in range(3)]
+
+
+def string_to_gene(s: str) -> Gene:
+    # the codon tuples are shared rather than built for every codon
+    return list(map(_CODONS.__getitem__, codon_ids(s)))
 
 
 # performs linear search
@@ -33,17 +109,33 @@ def linear_contains(gene: Gene, key_condon: Condon) -> bool:
     return False
 
 
-acg: Condon = (Nucleotide.A, Nucleotide.C, Nucleotide.G)
-gat: Condon = (Nucleotide.G, Nucleotide.A, Nucleotide.T)
+def ids_contain(ids: bytes, key_condon: Condon) -> bool:
+    """linear_contains over codon ids, as one scan in C"""
+    return codon_id(key_condon) in ids
+
+
+def ids_positions(ids: bytes, key_condon: Condon) -> array:
+    """The indexes of key_condon in codon ids"""
+    positions: array = array("q")
+    key: bytes = bytes([codon_id(key_condon)])
+    i: int = ids.find(key)
+    while i != -1:
+        positions.append(i)
+        i = ids.find(key, i + 1)
+    return positions
 
-print(linear_contains(studied_gene, acg)) # print(acg in studied_gene)
-print(linear_contains(studied_gene, gat))
+
+def codon_histogram(ids: bytes) -> List[int]:
+    """How many times each codon id occurs"""
+    counts: Counter = Counter(ids)
+    return [counts[i] for i in range(64)]
 
 
 def binary_contains(gene: Gene, key_condon: Condon) -> bool:
     # indexes for extremes
+    # gene has to be sorted, e.g. sorted(studied_gene)
     low: int = 0
-    hight: int = len(gene) - 1
+    high: int = len(gene) - 1
 
     while low <= high: #  meaning while there is still a search space
         mid: int = (low + high) // 2
@@ -56,4 +148,212 @@ def binary_contains(gene: Gene, key_condon: Condon) -> bool:
     return False
 
 
+Motif = Union[str, Sequence[Nucleotide]]
+
+
+def _motif_bytes(motif: Motif) -> bytes:
+    if isinstance(motif, str):
+        return motif.upper().encode("ascii")
+    return "".join(nucleotide.name for nucleotide in motif).encode("ascii")
+
+
+class GeneIndex:
+    """
+    Built once from a Gene or a raw sequence, answers where a codon or any
+    motif occurs without scanning the sequence again. In-frame codons go
+    through a hash table from codon to positions, motifs through a suffix
+    array in O(m log n + occ) for a motif of length m.
+    """
+    # suffixes are first sorted on this many nucleotides, then by doubling
+    _FIRST_PASS: int = 16
+
+    def __init__(self, gene: Union[Gene, str]) -> None:
+        if isinstance(gene, str):
+            self.sequence: bytes = gene.upper().encode("ascii")
+        else:
+            self.sequence = "".join(nucleotide.name for condon in gene
+                                    for nucleotide in condon).encode("ascii")
+        # in-frame codon -> its indexes in the Gene string_to_gene gives
+        self._codons: Dict[bytes, List[int]] = {}
+        for i in range(0, len(self.sequence) - 2, 3):
+            self._codons.setdefault(self.sequence[i:i + 3], []).append(i // 3)
+        self._suffixes: List[int] = self._suffix_array()
+
+    def _suffix_array(self) -> List[int]:
+        # prefix doubling: sort on the first _FIRST_PASS nucleotides, then
+        # on pairs of ranks of twice the length until every rank is unique
+        sequence: bytes = self.sequence
+        size: int = len(sequence)
+        width: int = self._FIRST_PASS
+        suffixes: List[int] = sorted(range(size),
+                                     key=lambda i: sequence[i:i + width])
+        rank: List[int] = [0] * size
+        for previous, suffix in zip(suffixes, suffixes[1:]):
+            rank[suffix] = rank[previous] + \
+                (sequence[previous:previous + width] !=
+                 sequence[suffix:suffix + width])
+        while size and rank[suffixes[-1]] < size - 1:
+            # -1 sorts a suffix that ends within width before the rest
+            keys: List[int] = [rank[i] * (size + 1) +
+                               (rank[i + width] + 1 if i + width < size
+                                else 0)
+                               for i in range(size)]
+            suffixes.sort(key=keys.__getitem__)
+            for previous, suffix in zip(suffixes, suffixes[1:]):
+                rank[suffix] = rank[previous] + \
+                    (keys[previous] != keys[suffix])
+            width *= 2
+        return suffixes
+
+    def _range(self, motif: bytes) -> Tuple[int, int]:
+        # the suffixes starting with motif lie next to each other
+        sequence: bytes = self.sequence
+        length: int = len(motif)
+
+        def prefix(i: int) -> bytes:
+            return sequence[i:i + length]
+        return (bisect_left(self._suffixes, motif, key=prefix),
+                bisect_right(self._suffixes, motif, key=prefix))
+
+    def __contains__(self, motif: Motif) -> bool:
+        low, high = self._range(_motif_bytes(motif))
+        return low < high
+
+    def count(self, motif: Motif) -> int:
+        low, high = self._range(_motif_bytes(motif))
+        return high - low
+
+    def positions(self, motif: Motif) -> List[int]:
+        """The nucleotide offsets at which motif starts, ascending"""
+        low, high = self._range(_motif_bytes(motif))
+        return sorted(self._suffixes[low:high])
+
+    def codon_positions(self, codon: Condon) -> List[int]:
+        """The indexes of codon in the gene as string_to_gene splits it"""
+        return list(self._codons.get(_motif_bytes(codon), ()))
+
+    def contains_codon(self, codon: Condon) -> bool:
+        return _motif_bytes(codon) in self._codons
+
+
+def gene_chunks(gene: Any, size: int = 1 << 16) -> Iterator[str]:
+    """
+    A gene as text, size nucleotides (or codons, for a Gene) at a time.
+    Works for str, Gene and anything else that slices into something str()
+    turns into nucleotides, like CompressedGene and MappedGene.
+    """
+    for start in range(0, len(gene), size):
+        piece: Any = gene[start:start + size]
+        if isinstance(piece, list):
+            yield "".join(nucleotide.name for condon in piece
+                          for nucleotide in condon)
+        else:
+            yield str(piece)
+
+
+class MotifMatches(NamedTuple):
+    pattern_ids: array  # index of the pattern in the matcher
+    positions: array  # nucleotide offset the match starts at
+
+
+class MotifMatcher:
+    """
+    Aho-Corasick automaton finding many motifs in one pass over a gene.
+    The failure links are folded into a full transition table over A, C,
+    G, T plus one column for any other symbol (N), which goes back to the
+    root, so each nucleotide costs one table lookup.
+    """
+    _CODES: bytes = bytes("ACGT".index(chr(b)) if chr(b) in "ACGT" else 4
+                          for b in range(256))
+    _WIDTH: int = 5  # columns per state
+
+    def __init__(self, patterns: Iterable[Motif]) -> None:
+        self.patterns: List[bytes] = [_motif_bytes(p) for p in patterns]
+        width: int = self._WIDTH
+        # trie first, -1 for missing edges; states are numbered by row
+        table: List[int] = [-1] * width
+        own: List[List[int]] = [[]]
+        for pattern_id, pattern in enumerate(self.patterns):
+            if not pattern:
+                raise ValueError("Empty motif")
+            state: int = 0
+            for code in pattern.translate(self._CODES):
+                if code == 4:
+                    raise ValueError("Invalid Nucleotide in motif: {}"
+                                     .format(pattern.decode("ascii")))
+                if table[state * width + code] == -1:
+                    table[state * width + code] = len(own)
+                    table.extend([-1] * width)
+                    own.append([])
+                state = table[state * width + code]
+            own[state].append(pattern_id)
+
+        # breadth first, so a state's failure state is done before it;
+        # missing edges become the failure state's transitions
+        fail: List[int] = [0] * len(own)
+        outputs: List[Tuple[int, ...]] = [()] * len(own)
+        queue: Deque[int] = deque()
+        for code in range(width):
+            if table[code] == -1:
+                table[code] = 0
+            else:
+                queue.append(table[code])
+        while queue:
+            state = queue.popleft()
+            outputs[state] = tuple(own[state]) + outputs[fail[state]]
+            for code in range(width):
+                child: int = table[state * width + code]
+                if code == 4:
+                    table[state * width + code] = 0
+                elif child == -1:
+                    table[state * width + code] = \
+                        table[fail[state] * width + code]
+                else:
+                    fail[child] = table[fail[state] * width + code]
+                    queue.append(child)
+        # entries hold the next state's row offset rather than its number
+        self._table: array = array("l", (state * width for state in table))
+        self._outputs: Dict[int, Tuple[int, ...]] = {
+            state * width: found for state, found in enumerate(outputs)
+            if found}
+        self._lengths: List[int] = [len(p) for p in self.patterns]
+
+    def search(self, chunks: Iterable[Union[str, bytes]]) -> MotifMatches:
+        """
+        Every occurrence of every pattern in the concatenated chunks,
+        matches across chunk boundaries included, ordered by where they
+        end. Give a str or bytes as a single chunk, or use gene_chunks.
+        """
+        table: array = self._table
+        outputs: Dict[int, Tuple[int, ...]] = self._outputs
+        lengths: List[int] = self._lengths
+        pattern_ids: array = array("l")
+        positions: array = array("q")
+        state: int = 0
+        offset: int = 0  # of the chunk in the whole sequence
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.upper().encode("ascii")
+            for i, code in enumerate(chunk.translate(self._CODES)):
+                state = table[state + code]
+                found: Optional[Tuple[int, ...]] = outputs.get(state)
+                if found is not None:
+                    for pattern_id in found:
+                        pattern_ids.append(pattern_id)
+                        positions.append(offset + i + 1 - lengths[pattern_id])
+            offset += len(chunk)
+        return MotifMatches(pattern_ids, positions)
+
+
+def main() -> None:
+    studied_gene: Gene = string_to_gene(gene_str)
+    acg: Condon = (Nucleotide.A, Nucleotide.C, Nucleotide.G)
+    gat: Condon = (Nucleotide.G, Nucleotide.A, Nucleotide.T)
+    print(linear_contains(studied_gene, acg))  # print(acg in studied_gene)
+    print(linear_contains(studied_gene, gat))
+    print(binary_contains(sorted(studied_gene), acg))
+    print(binary_contains(sorted(studied_gene), gat))
+
 
+if __name__ == "__main__":
+    main()
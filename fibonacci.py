@@ -6,24 +6,35 @@ def fib1(n: int) -> int:
 
     return fib1(n-1) + fib1(n-2)
 
-from typing import Dict
+from collections import OrderedDict
+from typing import List, Tuple
 
-memo : Dict[int, int] = {0: 0, 1:1}
+# how many results fib2 and fib3 keep; the recursion only ever needs the
+# last two, so older ones are dropped instead of growing without bound
+CACHE_SIZE: int = 1024
+
+memo : "OrderedDict[int, int]" = OrderedDict({0: 0, 1: 1})
 
 def fib2(n: int) -> int: 
     """This approach is recursive but uses 
         memoization"""
-    if n not in memo:
+    # not looked up in memo, where 0 and 1 are the first to be dropped
+    if n < 2 : return n
+    if n in memo:
+        memo.move_to_end(n)
+    else:
         memo[n] = fib2(n-1) + fib2(n-2)
+        if len(memo) > CACHE_SIZE:
+            memo.popitem(last=False)
     return memo[n]
 
 from functools import lru_cache
 
-@lru_cache(maxsize=None)
+@lru_cache(maxsize=CACHE_SIZE)
 def fib3(n: int) -> int:
     """This approach is recursive but uses
         caching mechanisms"""
-    if n < 2 : return 
+    if n < 2 : return n
     return fib3(n-1) + fib3(n-2)
 
 def fib4(n: int) -> int:
@@ -46,11 +57,66 @@ def fib5(n: int) -> int:
         last, next = next, last + next
         yield next
 
+def _fib_pair(n: int, modulus: int = 0) -> Tuple[int, int]:
+    # (F(n), F(n+1)) from the bits of n, most significant first, using
+    # F(2k) = F(k)(2F(k+1) - F(k)) and F(2k+1) = F(k)^2 + F(k+1)^2
+    a: int = 0
+    b: int = 1
+    for bit in bin(n)[2:]:
+        a, b = a * (2 * b - a), a * a + b * b
+        if bit == "1":
+            a, b = b, a + b
+        if modulus:
+            a %= modulus
+            b %= modulus
+    return a, b
+
+def fib6(n: int) -> int:
+    """This approach doubles n bit by bit (fast doubling), in O(log n)
+       multiplications"""
+    if n < 0:
+        raise ValueError("n must not be negative")
+    # the last doubling is the most expensive one, so only F(n) is made
+    a, b = _fib_pair(n >> 1)
+    if n & 1:
+        return a * a + b * b
+    return a * (2 * b - a)
+
+def fib_mod(n: int, modulus: int) -> int:
+    """F(n) mod modulus by fast doubling, fine for n up to 10^18 and
+       beyond since the numbers stay below modulus^2"""
+    if n < 0:
+        raise ValueError("n must not be negative")
+    if modulus < 1:
+        raise ValueError("modulus must be positive")
+    return _fib_pair(n, modulus)[0] % modulus
+
+def _matrix_product(x: List[int], y: List[int]) -> List[int]:
+    # 2x2 matrices as [a, b, c, d] for ((a, b), (c, d))
+    return [x[0] * y[0] + x[1] * y[2], x[0] * y[1] + x[1] * y[3],
+            x[2] * y[0] + x[3] * y[2], x[2] * y[1] + x[3] * y[3]]
+
+def fib7(n: int) -> int:
+    """This approach raises ((1, 1), (1, 0)) to the power n by repeated
+       squaring"""
+    if n < 0:
+        raise ValueError("n must not be negative")
+    result: List[int] = [1, 0, 0, 1]
+    power: List[int] = [1, 1, 1, 0]
+    while n:
+        if n & 1:
+            result = _matrix_product(result, power)
+        power = _matrix_product(power, power)
+        n >>= 1
+    return result[1]
+
 if __name__ == "__main__":
     print(fib1(10))
     print(fib2(15))
     print(fib3(4))
-    print(fib4(11)
-    print(fib5(23))
+    print(fib4(11))
+    print(list(fib5(23)))
+    print(fib6(100))
+    print(fib_mod(10 ** 18, 10 ** 9 + 7))
 
 
@@ -1,9 +1,34 @@
-from typing import Generic, TypeVar, Dict, List, Optional
+from typing import \
+    Generic, \
+    TypeVar, \
+    Dict, \
+    List, \
+    Optional, \
+    Set, \
+    Tuple, \
+    Callable, \
+    Iterator
 from abc import ABC, abstractmethod
+from heapq import heappush, heappop, heapify
+from itertools import repeat
+from concurrent.futures import \
+    ProcessPoolExecutor, \
+    Future, \
+    wait, \
+    FIRST_COMPLETED
+from multiprocessing import Event
+from os import cpu_count
+from random import Random
 
 V = TypeVar('V')  # variable
 D = TypeVar('D')  # domain
 
+_UNASSIGNED = object()  # stands in for the value of unassigned variables
+
+
+class SearchInterrupted(Exception):
+    """Raised by a search whose should_stop callback returned True"""
+
 
 class Constraint(Generic[V, D], ABC):
     """Base class for all constraints"""
@@ -17,6 +42,230 @@ class Constraint(Generic[V, D], ABC):
         ...
 
 
+class NotEqualConstraint(Constraint[V, D]):
+    """
+    Two variables must take different values. The CSP keeps these as an
+    adjacency list and checks them without calling satisfied, unless a
+    subclass overrides satisfied.
+    """
+    def __init__(self, first: V, second: V) -> None:
+        super().__init__([first, second])
+        self.first: V = first
+        self.second: V = second
+
+    def satisfied(self, assignment: Dict[V, D]) -> bool:
+        if self.first not in assignment or self.second not in assignment:
+            return True
+        return assignment[self.first] != assignment[self.second]
+
+
+def _plain_not_equal(constraint: Constraint) -> bool:
+    # a not-equal constraint whose satisfied the CSP may skip
+    return isinstance(constraint, NotEqualConstraint) and \
+        type(constraint).satisfied is NotEqualConstraint.satisfied
+
+
+class VariableOrder(Generic[V, D], ABC):
+    """
+    Chooses the next variable to assign. The search reports every
+    assignment, unassignment and change of a live domain size, so that an
+    order can keep its own bookkeeping instead of rescanning all variables.
+    """
+    def start(self, csp: "CSP[V, D]", assignment: Dict[V, D]) -> None:
+        ...
+
+    @abstractmethod
+    def select(self) -> V:
+        ...
+
+    def assigned(self, variable: V) -> None:
+        ...
+
+    def unassigned(self, variable: V) -> None:
+        ...
+
+    def resized(self, variable: V, size: int) -> None:
+        ...
+
+
+class DeclarationOrder(VariableOrder[V, D]):
+    """The first unassigned variable, in the order given to the CSP"""
+    def start(self, csp: "CSP[V, D]", assignment: Dict[V, D]) -> None:
+        self._variables: List[V] = csp.variables
+        self._positions: Dict[V, int] = {v: i for i, v
+                                         in enumerate(csp.variables)}
+        self._assigned: Set[V] = set(assignment)
+        self._next: int = 0
+        self._skip_assigned()
+
+    def _skip_assigned(self) -> None:
+        while self._next < len(self._variables) and \
+                self._variables[self._next] in self._assigned:
+            self._next += 1
+
+    def select(self) -> V:
+        return self._variables[self._next]
+
+    def assigned(self, variable: V) -> None:
+        self._assigned.add(variable)
+        self._skip_assigned()
+
+    def unassigned(self, variable: V) -> None:
+        self._assigned.discard(variable)
+        self._next = min(self._next, self._positions[variable])
+
+
+class MinimumRemainingValues(VariableOrder[V, D]):
+    """
+    The unassigned variable with the fewest live values, ties going to the
+    one constrained with the most other variables (degree heuristic).
+    Variables sit in one heap per live domain size, so selecting only looks
+    at the smallest non-empty size; entries made stale by later changes
+    are dropped when they reach the top, or all at once when a heap fills
+    up with them.
+    """
+    def start(self, csp: "CSP[V, D]", assignment: Dict[V, D]) -> None:
+        self._assigned: Set[V] = set(assignment)
+        self._sizes: Dict[V, int] = csp._sizes
+        self._keys: Dict[V, Tuple[int, int]] = {}
+        for position, variable in enumerate(csp.variables):
+            neighbours: Set[V] = {other
+                                  for constraint in csp.constraints[variable]
+                                  for other in constraint.variables}
+            neighbours.discard(variable)
+            self._keys[variable] = (-len(neighbours), position)
+        largest: int = max((len(csp.domains[v]) for v in csp.variables),
+                           default=0)
+        self._buckets: List[List[Tuple[int, int, V]]] = \
+            [[] for _ in range(largest + 1)]
+        for variable in csp.variables:
+            if variable not in assignment:
+                self.unassigned(variable)
+
+    def select(self) -> V:
+        for size, bucket in enumerate(self._buckets):
+            while bucket:
+                variable: V = bucket[0][2]
+                if variable not in self._assigned and \
+                        self._sizes[variable] == size:
+                    return variable
+                heappop(bucket)
+        raise LookupError("No unassigned variable left")
+
+    def assigned(self, variable: V) -> None:
+        self._assigned.add(variable)
+
+    def unassigned(self, variable: V) -> None:
+        self._assigned.discard(variable)
+        self.resized(variable, self._sizes[variable])
+
+    def resized(self, variable: V, size: int) -> None:
+        if variable not in self._assigned:
+            bucket: List[Tuple[int, int, V]] = self._buckets[size]
+            heappush(bucket, self._keys[variable] + (variable,))
+            if len(bucket) > 2 * len(self._keys) + 64:
+                self._compact(bucket, size)
+
+    def _compact(self, bucket: List[Tuple[int, int, V]], size: int) -> None:
+        # drop the stale and repeated entries a long search leaves behind
+        kept: Dict[V, Tuple[int, int, V]] = {
+            entry[2]: entry for entry in bucket
+            if entry[2] not in self._assigned
+            and self._sizes[entry[2]] == size}
+        bucket[:] = list(kept.values())
+        heapify(bucket)
+
+
+ValueOrder = Callable[["CSP[V, D]", V, Dict[V, D]], List[D]]
+
+
+def declaration_value_order(csp: "CSP[V, D]",
+                            variable: V,
+                            assignment: Dict[V, D]) -> List[D]:
+    """The live values of variable in the order of its domain"""
+    return csp.live_domain(variable)
+
+
+def least_constraining_value(csp: "CSP[V, D]",
+                             variable: V,
+                             assignment: Dict[V, D]) -> List[D]:
+    """
+    The live values of variable, those ruling out the fewest live values of
+    its unassigned neighbours through binary constraints first
+    """
+    binary: List[Tuple[V, Constraint[V, D]]] = [
+        (other, constraint) for constraint in csp.constraints[variable]
+        if len(constraint.variables) == 2
+        for other in constraint.variables
+        if other != variable and other not in assignment]
+    ruled_out: Dict[D, int] = {}
+    for value in csp.live_domain(variable):
+        count: int = 0
+        for other, constraint in binary:
+            for other_value in csp.live_domain(other):
+                if not constraint.satisfied({variable: value,
+                                             other: other_value}):
+                    count += 1
+        ruled_out[value] = count
+    return sorted(ruled_out, key=ruled_out.__getitem__)
+
+
+class RandomValueOrder:
+    """The live values of a variable shuffled, seeded to be repeatable"""
+    def __init__(self, seed: int) -> None:
+        self.random: Random = Random(seed)
+
+    def __call__(self,
+                 csp: "CSP[V, D]",
+                 variable: V,
+                 assignment: Dict[V, D]) -> List[D]:
+        values: List[D] = csp.live_domain(variable)
+        self.random.shuffle(values)
+        return values
+
+
+# set in each worker of solve_parallel, once one of them finds a solution
+_stop_event = None
+
+
+def _init_worker(stop_event) -> None:
+    global _stop_event
+    _stop_event = stop_event
+
+
+def _solve_task(csp: "CSP[V, D]",
+                assignment: Dict[V, D],
+                inference: Optional[str],
+                variable_order: VariableOrder[V, D],
+                value_order: ValueOrder) -> Tuple[Optional[Dict[V, D]], int]:
+    # runs in a worker process of solve_parallel
+    solution: Optional[Dict[V, D]] = csp.backtracking_search(
+        assignment, inference, variable_order, value_order,
+        should_stop=_stop_event.is_set)
+    return solution, csp.nodes_explored
+
+
+class _CountFrame(Generic[V, D]):
+    # a component being counted by CSP.count_solutions: the variable
+    # chosen to branch on, the other variables, the values still to try and
+    # the count so far; while a value is assigned, the parts the rest falls
+    # into that are still to count, the product of those counted and the
+    # trail length to undo to
+    def __init__(self,
+                 key: tuple,
+                 variable: V,
+                 rest: List[V],
+                 values: Iterator[D]) -> None:
+        self.key: tuple = key
+        self.variable: V = variable
+        self.rest: List[V] = rest
+        self.values: Iterator[D] = values
+        self.count: int = 0
+        self.parts: Optional[List[List[V]]] = None
+        self.product: int = 1
+        self.mark: int = 0
+
+
 class CSP(Generic[V, D]):
     """
     A constraint-satisfaction problem consists of variables of type V
@@ -32,40 +281,515 @@ class CSP(Generic[V, D]):
             if variable not in self.domains:
                 raise LookupError("Every variable should have a domain "
                                   "assigned to it")
+        # the constraints on each variable again, indexed by arity:
+        # neighbours it must differ from, (other variable, constraint) pairs
+        # for other binary constraints, and unary and n-ary constraints
+        self._different: Dict[V, List[V]] = {v: [] for v in self.variables}
+        self._binary: Dict[V, List[Tuple[V, Constraint[V, D]]]] = \
+            {v: [] for v in self.variables}
+        self._unary: Dict[V, List[Constraint[V, D]]] = \
+            {v: [] for v in self.variables}
+        self._nary: Dict[V, List[Constraint[V, D]]] = \
+            {v: [] for v in self.variables}
+        self.nodes_explored: int = 0  # values tried by the last search
+        self._reset_domains()
 
     def add_constraint(self, constraint: Constraint[V, D]) -> None:
         for variable in constraint.variables:
-            if variable not in self.variables:
+            if variable not in self.constraints:
                 raise LookupError("Variables in constraint not in CSP")
+        for variable in constraint.variables:
+            self.constraints[variable].append(constraint)
+        variables: List[V] = constraint.variables
+        if len(variables) == 1:
+            self._unary[variables[0]].append(constraint)
+        elif len(variables) == 2:
+            first, second = variables
+            if _plain_not_equal(constraint):
+                self._different[first].append(second)
+                self._different[second].append(first)
             else:
-                self.constraints[variable].append(constraint)
+                self._binary[first].append((second, constraint))
+                self._binary[second].append((first, constraint))
+        else:
+            for variable in variables:
+                self._nary[variable].append(constraint)
 
     def consistent(self, variable: V, assignment: Dict[V, D]) -> bool:
-        for constraint in self.constraints[variable]:
+        value: object = assignment.get(variable, _UNASSIGNED)
+        if value is not _UNASSIGNED:
+            # compares with every assigned neighbour without a Python-level
+            # call per constraint
+            if value in map(assignment.get, self._different[variable],
+                            repeat(_UNASSIGNED)):
+                return False
+            for constraint in self._unary[variable]:
+                if not constraint.satisfied(assignment):
+                    return False
+        # binary constraints can only fail once both ends are assigned
+        for other, constraint in self._binary[variable]:
+            if other in assignment and not constraint.satisfied(assignment):
+                return False
+        for constraint in self._nary[variable]:
             if not constraint.satisfied(assignment):
                 return False
         return True
 
-    def backtracking_search(self, assignment: Dict[V, D] = {}) -> \
-            Optional[Dict[V, D]]:
-        # assignment is complete if every variable is assigned
-        if len(assignment) == len(self.variables):
-            return assignment
-
-        # get all variables in the CSP but not in the assignment
-        unassigned: List[V] = [v for v in self.variables
-                               if v not in assignment]
-
-        # get the every possible domain value of the first unassigned variable
-        first: V = unassigned[0]
-        for value in self.domains[first]:
-            local_assignment = assignment.copy()
-            local_assignment[first] = value
-            # if we are still consistent, we recurse
-            if self.consistent(first, local_assignment):
-                result: Optional[Dict[V, D]] = \
-                    self.backtracking_search(local_assignment)
-                # if the result is found, we will end up backtracking
-                if result is not None:
-                    return result
+    def _reset_domains(self) -> None:
+        # values pruned from each domain during a search, undone through the
+        # trail rather than by copying domains at every level
+        self._removed: Dict[V, Set[D]] = {v: set() for v in self.variables}
+        self._sizes: Dict[V, int] = {v: len(self.domains[v])
+                                     for v in self.variables}
+        self._trail: List[Tuple[V, D]] = []
+        self._order: Optional[VariableOrder[V, D]] = None
+
+    def live_domain(self, variable: V) -> List[D]:
+        """The values of variable not pruned by the current search"""
+        removed: Set[D] = self._removed[variable]
+        return [value for value in self.domains[variable]
+                if value not in removed]
+
+    def _prune(self, variable: V, value: D) -> None:
+        self._removed[variable].add(value)
+        self._sizes[variable] -= 1
+        self._trail.append((variable, value))
+        if self._order is not None:
+            self._order.resized(variable, self._sizes[variable])
+
+    def _undo(self, mark: int) -> None:
+        # restore everything pruned since the trail was mark entries long
+        while len(self._trail) > mark:
+            variable, value = self._trail.pop()
+            self._removed[variable].discard(value)
+            self._sizes[variable] += 1
+            if self._order is not None:
+                self._order.resized(variable, self._sizes[variable])
+
+    def _revise(self, x: V, y: V, constraint: Constraint[V, D]) -> bool:
+        # prune the values of x that no value of y supports
+        revised: bool = False
+        y_values: List[D] = self.live_domain(y)
+        if _plain_not_equal(constraint):
+            # only a value y is left with lacks support
+            if len(y_values) == 1 and y_values[0] not in self._removed[x] \
+                    and y_values[0] in self.domains[x]:
+                self._prune(x, y_values[0])
+                return True
+            return False
+        for a in self.live_domain(x):
+            if not any(constraint.satisfied({x: a, y: b}) for b in y_values):
+                self._prune(x, a)
+                revised = True
+        return revised
+
+    def _arcs(self, variable: V, assignment: Dict[V, D]) \
+            -> List[Tuple[V, V, Constraint[V, D]]]:
+        # (other, variable) arcs of the binary constraints on variable
+        return [(other, variable, constraint)
+                for constraint in self.constraints[variable]
+                if len(constraint.variables) == 2
+                for other in constraint.variables
+                if other != variable and other not in assignment]
+
+    def ac3(self,
+            arcs: Optional[List[Tuple[V, V, Constraint[V, D]]]] = None,
+            assignment: Optional[Dict[V, D]] = None) -> bool:
+        """
+        Makes the binary constraints between unassigned variables arc
+        consistent, pruning domains on the trail. Starts from every arc
+        unless given some. Returns False if a domain became empty.
+        """
+        if assignment is None:
+            assignment = {}
+        if arcs is None:
+            arcs = [arc for variable in self.variables
+                    if variable not in assignment
+                    for arc in self._arcs(variable, assignment)]
+        queue: List[Tuple[V, V, Constraint[V, D]]] = list(arcs)
+        while queue:
+            x, y, constraint = queue.pop()
+            if self._revise(x, y, constraint):
+                if self._sizes[x] == 0:
+                    return False
+                queue.extend(arc for arc in self._arcs(x, assignment)
+                             if arc[0] != y)
+        return True
+
+    def _forward_check(self, variable: V, assignment: Dict[V, D]) -> bool:
+        # prune the values of variables left alone unassigned in a constraint
+        # with variable that would violate it; False on a wipe-out
+        value: D = assignment[variable]
+        for other in self._different[variable]:
+            if other not in assignment and \
+                    value not in self._removed[other] and \
+                    value in self.domains[other]:
+                self._prune(other, value)
+                if self._sizes[other] == 0:
+                    return False
+        for constraint in self._nary[variable] + \
+                [constraint for _, constraint in self._binary[variable]]:
+            unassigned: List[V] = [v for v in constraint.variables
+                                   if v not in assignment]
+            if len(unassigned) != 1:
+                continue
+            other: V = unassigned[0]
+            for other_value in self.live_domain(other):
+                assignment[other] = other_value
+                supported: bool = constraint.satisfied(assignment)
+                del assignment[other]
+                if not supported:
+                    self._prune(other, other_value)
+            if self._sizes[other] == 0:
+                return False
+        return True
+
+    def _infer(self,
+               variable: V,
+               assignment: Dict[V, D],
+               inference: Optional[str]) -> bool:
+        if inference is None:
+            return True
+        if not self._forward_check(variable, assignment):
+            return False
+        if inference == "mac":
+            # maintain arc consistency around the neighbours just pruned
+            return self.ac3([arc for other, _, _ in
+                             self._arcs(variable, assignment)
+                             for arc in self._arcs(other, assignment)],
+                            assignment)
+        return True
+
+    def _prepare(self,
+                 assignment: Optional[Dict[V, D]],
+                 inference: Optional[str]) -> Optional[Dict[V, D]]:
+        # fresh domains narrowed to the given assignment and to the unary
+        # constraints, then pruned by the inference; None if that shows
+        # there is no solution
+        if inference not in (None, "forward_checking", "mac"):
+            raise ValueError("Unknown inference: {}".format(inference))
+        assignment = {} if assignment is None else dict(assignment)
+        self.nodes_explored = 0
+        self._reset_domains()
+        for variable, value in assignment.items():
+            for other in self.live_domain(variable):
+                if other != value:
+                    self._prune(variable, other)
+        # unary constraints only need checking once, against the domains
+        for variable, constraints in self._unary.items():
+            for value in self.live_domain(variable):
+                if not all(constraint.satisfied({variable: value})
+                           for constraint in constraints):
+                    self._prune(variable, value)
+            if self._sizes[variable] == 0:
+                return None
+        if not all(self.consistent(variable, assignment)
+                   for variable in assignment):
+            return None
+        if inference is not None:
+            # the given values prune their unassigned neighbours first
+            for variable in list(assignment):
+                if not self._forward_check(variable, assignment):
+                    return None
+            if not self.ac3(assignment=assignment):
+                return None
+        return assignment
+
+    def backtracking_search(self,
+                            assignment: Optional[Dict[V, D]] = None,
+                            inference: Optional[str] = "forward_checking",
+                            variable_order:
+                            Optional[VariableOrder[V, D]] = None,
+                            value_order: ValueOrder =
+                            declaration_value_order,
+                            should_stop:
+                            Optional[Callable[[], bool]] = None) \
+            -> Optional[Dict[V, D]]:
+        """
+        Depth-first search over assignments. inference is None (only check
+        consistency), "forward_checking" or "mac" (maintain arc
+        consistency); with either of the latter, AC-3 runs first.
+        variable_order defaults to DeclarationOrder; MinimumRemainingValues
+        relies on inference to shrink domains. value_order can be
+        least_constraining_value. nodes_explored counts the values tried.
+        should_stop is called every 1024 values tried; once it returns
+        True the search raises SearchInterrupted, so that giving up is not
+        mistaken for there being no solution.
+        """
+        solutions: Iterator[Dict[V, D]] = self.iter_solutions(
+            assignment, inference, variable_order, value_order, should_stop)
+        try:
+            return next(solutions, None)
+        finally:
+            solutions.close()
+
+    def iter_solutions(self,
+                       assignment: Optional[Dict[V, D]] = None,
+                       inference: Optional[str] = "forward_checking",
+                       variable_order: Optional[VariableOrder[V, D]] = None,
+                       value_order: ValueOrder = declaration_value_order,
+                       should_stop: Optional[Callable[[], bool]] = None) \
+            -> Iterator[Dict[V, D]]:
+        """
+        Yields every solution, one at a time, in the order
+        backtracking_search would reach them; the arguments are the same,
+        and a stopped search raises SearchInterrupted from the generator.
+        Only one search can run on a CSP at a time, so finish or close the
+        generator before starting another.
+        """
+        assignment = self._prepare(assignment, inference)
+        if assignment is None:
+            return
+        self._order = DeclarationOrder() if variable_order is None \
+            else variable_order
+        self._order.start(self, assignment)
+        try:
+            yield from self._backtrack(assignment, inference, value_order,
+                                       should_stop)
+        finally:
+            self._order = None
+
+    def _backtrack(self,
+                   assignment: Dict[V, D],
+                   inference: Optional[str],
+                   value_order: ValueOrder,
+                   should_stop: Optional[Callable[[], bool]]) \
+            -> Iterator[Dict[V, D]]:
+        # an explicit stack instead of recursion, so the depth is not bound
+        # by the recursion limit; each frame holds a variable, the values
+        # still to try for it and the trail length before it was assigned.
+        # assignment is extended and retracted in place.
+        stack: List[Tuple[V, Iterator[D], int]] = []
+        descend: bool = True
+        while True:
+            if descend:
+                # assignment is complete if every variable is assigned
+                if len(assignment) == len(self.variables):
+                    yield dict(assignment)
+                else:
+                    # let the variable order pick among the unassigned
+                    # variables
+                    variable: V = self._order.select()
+                    stack.append((variable,
+                                  iter(value_order(self, variable,
+                                                   assignment)),
+                                  len(self._trail)))
+            if not stack:
+                return
+            variable, values, mark = stack[-1]
+            if variable in assignment:
+                # backtracking into this frame, so retract its last value
+                del assignment[variable]
+                self._undo(mark)
+                self._order.unassigned(variable)
+            descend = False
+            for value in values:
+                self.nodes_explored += 1
+                if should_stop is not None and \
+                        self.nodes_explored % 1024 == 0 and should_stop():
+                    raise SearchInterrupted(
+                        "Stopped after {} values".format(self.nodes_explored))
+                assignment[variable] = value
+                # if we are still consistent, prune what the value rules out
+                # and go one level deeper
+                if self.consistent(variable, assignment):
+                    self._order.assigned(variable)
+                    if self._infer(variable, assignment, inference):
+                        descend = True
+                        break
+                    self._undo(mark)
+                    self._order.unassigned(variable)
+                del assignment[variable]
+            if not descend:
+                stack.pop()
+
+    def count_solutions(self, assignment: Optional[Dict[V, D]] = None) \
+            -> int:
+        """
+        The number of solutions extending assignment, without enumerating
+        them: variables that share no constraint once the assigned ones
+        are taken out are counted separately and the counts multiplied, and
+        the count of a group of variables is remembered for when the same
+        group comes back with the same live domains. Uses forward
+        checking; nodes_explored counts the values tried.
+        """
+        assignment = self._prepare(assignment, "forward_checking")
+        if assignment is None:
+            return 0
+        neighbours: Dict[V, Set[V]] = {v: set() for v in self.variables}
+        for variable in self.variables:
+            for constraint in self.constraints[variable]:
+                neighbours[variable].update(constraint.variables)
+            neighbours[variable].discard(variable)
+        positions: Dict[V, int] = {v: i for i, v in enumerate(self.variables)}
+        cache: Dict[tuple, int] = {}
+        total: int = 1
+        for component in self._components(
+                [v for v in self.variables if v not in assignment],
+                neighbours, positions):
+            total *= self._count(component, assignment, neighbours,
+                                 positions, cache)
+            if total == 0:
+                break
+        return total
+
+    @staticmethod
+    def _components(variables: List[V],
+                    neighbours: Dict[V, Set[V]],
+                    positions: Dict[V, int]) -> List[List[V]]:
+        # the groups of variables connected through constraints, each in
+        # declaration order
+        remaining: Set[V] = set(variables)
+        components: List[List[V]] = []
+        for variable in variables:
+            if variable not in remaining:
+                continue
+            remaining.discard(variable)
+            component: List[V] = [variable]
+            for member in component:
+                for other in neighbours[member]:
+                    if other in remaining:
+                        remaining.discard(other)
+                        component.append(other)
+            component.sort(key=positions.__getitem__)
+            components.append(component)
+        return components
+
+    def _count(self,
+               component: List[V],
+               assignment: Dict[V, D],
+               neighbours: Dict[V, Set[V]],
+               positions: Dict[V, int],
+               cache: Dict[tuple, int]) -> int:
+        # an explicit stack of the components being counted instead of
+        # recursion, so a long chain of variables does not run into the
+        # recursion limit. assignment is extended and retracted in place.
+        stack: List[_CountFrame[V, D]] = []
+        result: Optional[int] = self._count_start(component, assignment,
+                                                  neighbours, positions,
+                                                  cache, stack)
+        while stack:
+            frame: _CountFrame[V, D] = stack[-1]
+            if result is not None:
+                # a part of the current value's components has been counted
+                frame.product *= result
+                result = None
+            if frame.parts is not None:
+                if frame.product != 0 and frame.parts:
+                    result = self._count_start(frame.parts.pop(), assignment,
+                                               neighbours, positions, cache,
+                                               stack)
+                    continue
+                # every part counted, so retract the value
+                frame.count += frame.product
+                frame.parts = None
+                self._undo(frame.mark)
+                del assignment[frame.variable]
+            for value in frame.values:
+                self.nodes_explored += 1
+                assignment[frame.variable] = value
+                if self.consistent(frame.variable, assignment):
+                    frame.mark = len(self._trail)
+                    if self._forward_check(frame.variable, assignment):
+                        # what is left falls apart into parts counted
+                        # separately, whose counts multiply
+                        frame.parts = self._components(frame.rest,
+                                                       neighbours, positions)
+                        frame.parts.reverse()
+                        frame.product = 1
+                        break
+                    self._undo(frame.mark)
+                del assignment[frame.variable]
+            if frame.parts is None:
+                # every value tried
+                cache[frame.key] = frame.count
+                result = frame.count
+                stack.pop()
+        return result
+
+    def _count_start(self,
+                     component: List[V],
+                     assignment: Dict[V, D],
+                     neighbours: Dict[V, Set[V]],
+                     positions: Dict[V, int],
+                     cache: Dict[tuple, int],
+                     stack: List["_CountFrame[V, D]"]) -> Optional[int]:
+        # the count of component if it is cached, otherwise None with a
+        # frame for counting it pushed on stack. forward checking has
+        # already folded the assigned neighbours of binary constraints into
+        # the live domains; those of n-ary constraints go into the key as
+        # they are
+        boundary: List[V] = sorted(
+            {other for v in component for constraint in self._nary[v]
+             for other in constraint.variables if other in assignment},
+            key=positions.__getitem__)
+        key: tuple = (tuple(component),
+                      tuple(tuple(self.live_domain(v)) for v in component),
+                      tuple(assignment[v] for v in boundary))
+        if key in cache:
+            return cache[key]
+        variable: V = min(component, key=lambda v: (self._sizes[v],
+                                                    -len(neighbours[v])))
+        stack.append(_CountFrame(key, variable,
+                                 [v for v in component if v != variable],
+                                 iter(self.live_domain(variable))))
         return None
+
+    def solve_parallel(self,
+                       workers: Optional[int] = None,
+                       strategy: str = "portfolio",
+                       inference: Optional[str] = "forward_checking") \
+            -> Optional[Dict[V, D]]:
+        """
+        Runs backtracking_search in a pool of worker processes, so the CSP
+        and its constraints have to be picklable. "portfolio" runs one
+        solver per worker, all with MinimumRemainingValues but with
+        different value orders; the first to finish decides, since each
+        one searches the whole space. "split" gives every value of the
+        most constrained variable its own search; it is unsatisfiable only
+        once all of them fail. Either way, the remaining searches are
+        cancelled as soon as a solution is found. nodes_explored adds up
+        the values tried by the searches that finished.
+        """
+        if strategy not in ("portfolio", "split"):
+            raise ValueError("Unknown strategy: {}".format(strategy))
+        workers = workers or cpu_count() or 1
+        tasks: List[Tuple[Dict[V, D], ValueOrder]] = []
+        if strategy == "portfolio":
+            value_orders: List[ValueOrder] = \
+                [declaration_value_order, least_constraining_value]
+            value_orders += [RandomValueOrder(seed)
+                             for seed in range(workers - len(value_orders))]
+            tasks = [({}, value_order)
+                     for value_order in value_orders[:workers]]
+        else:
+            degree: Dict[V, int] = {v: len(self.constraints[v])
+                                    for v in self.variables}
+            root: V = min(self.variables,
+                          key=lambda v: (len(self.domains[v]), -degree[v]))
+            tasks = [({root: value}, declaration_value_order)
+                     for value in self.domains[root]]
+
+        self.nodes_explored = 0
+        stop_event = Event()
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(stop_event,)) as executor:
+            pending: Set[Future] = {
+                executor.submit(_solve_task, self, assignment, inference,
+                                MinimumRemainingValues(), value_order)
+                for assignment, value_order in tasks}
+            try:
+                while pending:
+                    done, pending = wait(pending,
+                                         return_when=FIRST_COMPLETED)
+                    for future in done:
+                        solution, nodes = future.result()
+                        self.nodes_explored += nodes
+                        if solution is not None or strategy == "portfolio":
+                            return solution
+                return None
+            finally:
+                # stop the searches still running and drop those not started
+                stop_event.set()
+                for future in pending:
+                    future.cancel()
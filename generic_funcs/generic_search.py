@@ -11,8 +11,22 @@ from typing import \
     Dict, \
     Any, \
     Optional, \
-    Protocol
+    Protocol, \
+    Tuple, \
+    Iterator, \
+    NamedTuple
+import asyncio
+from array import array
+from collections import deque
+from concurrent.futures import \
+    ProcessPoolExecutor, \
+    Future, \
+    wait, \
+    FIRST_COMPLETED
 from heapq import heappush, heappop
+from itertools import count, islice
+from os import cpu_count
+from time import perf_counter
 
 T = TypeVar('T')
 
@@ -67,6 +81,9 @@ class Stack(Generic[T]):
     def empty(self) -> bool:
         return not self._container
 
+    def __len__(self) -> int:
+        return len(self._container)
+
     def push(self, item: T) -> None:
         self._container.append(item)
 
@@ -85,6 +102,9 @@ class Queue(Generic[T]):
     def empty(self) -> bool:
         return not self._container
 
+    def __len__(self) -> int:
+        return len(self._container)
+
     def push(self, item: T) -> None:
         self._container.append(item)
 
@@ -103,6 +123,9 @@ class PriorityQueue(Generic[T]):
     def empty(self) -> bool:
         return not self._container
 
+    def __len__(self) -> int:
+        return len(self._container)
+
     def push(self, item: T) -> None:
         return heappush(self._container, item)  # in by priority in O(log(n))
 
@@ -113,7 +136,91 @@ class PriorityQueue(Generic[T]):
         return repr(self._container)
 
 
+class IndexedPriorityQueue(Generic[T]):
+    """
+    Binary heap of Nodes holding at most one entry per state. A position
+    index from state to heap slot allows a queued Node to be replaced by a
+    cheaper one in place (decrease-key) instead of pushing a duplicate.
+    """
+    def __init__(self) -> None:
+        self._container: List[Node[T]] = []
+        self._positions: Dict[T, int] = {}
+
+    @property
+    def empty(self) -> bool:
+        return not self._container
+
+    def __len__(self) -> int:
+        return len(self._container)
+
+    def __contains__(self, state: T) -> bool:
+        return state in self._positions
+
+    def get(self, state: T) -> Optional[Node[T]]:
+        position: Optional[int] = self._positions.get(state)
+        return None if position is None else self._container[position]
+
+    def push(self, item: Node[T]) -> None:
+        if item.state in self._positions:
+            raise KeyError("State already queued, use decrease_key")
+        self._container.append(item)
+        self._sift_up(len(self._container) - 1, item)
+
+    def decrease_key(self, item: Node[T]) -> None:
+        # item replaces the queued Node of the same state, it must not be worse
+        self._sift_up(self._positions[item.state], item)
+
+    def peek(self) -> Node[T]:
+        return self._container[0]
+
+    def pop(self) -> Node[T]:
+        container: List[Node[T]] = self._container
+        top: Node[T] = container[0]
+        del self._positions[top.state]
+        last: Node[T] = container.pop()
+        if container:
+            self._sift_down(0, last)
+        return top
+
+    def _sift_up(self, position: int, item: Node[T]) -> None:
+        container: List[Node[T]] = self._container
+        positions: Dict[T, int] = self._positions
+        while position > 0:
+            parent: int = (position - 1) >> 1
+            parent_item: Node[T] = container[parent]
+            if not item < parent_item:
+                break
+            container[position] = parent_item
+            positions[parent_item.state] = position
+            position = parent
+        container[position] = item
+        positions[item.state] = position
+
+    def _sift_down(self, position: int, item: Node[T]) -> None:
+        container: List[Node[T]] = self._container
+        positions: Dict[T, int] = self._positions
+        size: int = len(container)
+        child: int = 2 * position + 1
+        while child < size:
+            right: int = child + 1
+            if right < size and container[right] < container[child]:
+                child = right
+            if not container[child] < item:
+                break
+            container[position] = container[child]
+            positions[container[position].state] = position
+            position = child
+            child = 2 * position + 1
+        container[position] = item
+        positions[item.state] = position
+
+    def __repr__(self) -> str:
+        return repr(self._container)
+
+
 class Node(Generic[T]):
+    __slots__ = ('state', 'parent', 'cost', 'heuristic')
+
     def __init__(self,
                  state: T,
                  parent: Optional[Node],
@@ -129,73 +236,234 @@ class Node(Generic[T]):
         return (self.cost + self.heuristic) < (other.cost + other.heuristic)
 
 
+class NodeArena(Generic[T]):
+    """
+    Struct-of-arrays store for a search tree. Entry i holds a state, the
+    index of its parent entry (-1 for the root) and its cost, so each
+    reached state costs a list slot and two array items instead of a Node.
+    """
+    __slots__ = ('states', 'parents', 'costs')
+
+    def __init__(self) -> None:
+        self.states: List[T] = []
+        self.parents: array = array('l')
+        self.costs: array = array('d')
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def add(self, state: T, parent: int = -1, cost: float = 0.0) -> int:
+        self.states.append(state)
+        self.parents.append(parent)
+        self.costs.append(cost)
+        return len(self.states) - 1
+
+    def path(self, index: int) -> List[T]:
+        # node_to_path for arena entries, walking the parent array
+        indices: List[int] = [index]
+        while self.parents[indices[-1]] != -1:
+            indices.append(self.parents[indices[-1]])
+        return [self.states[i] for i in reversed(indices)]
+
+    def to_node(self, index: int) -> Node[T]:
+        # Node chain for the path to index, for callers of node_to_path
+        indices: List[int] = [index]
+        while self.parents[indices[-1]] != -1:
+            indices.append(self.parents[indices[-1]])
+        node: Optional[Node[T]] = None
+        for i in reversed(indices):
+            node = Node(self.states[i], node, self.costs[i])
+        return node
+
+
+class SearchStats:
+    """
+    Counters describing the work and memory a search used. Passing one to
+    dfs, bfs or astar turns on their instrumentation, including the
+    optional on_expand, on_push and on_goal callbacks, which receive the
+    state concerned; without one they run uninstrumented.
+    """
+    def __init__(self,
+                 on_expand: Optional[Callable[[Any], None]] = None,
+                 on_push: Optional[Callable[[Any], None]] = None,
+                 on_goal: Optional[Callable[[Any], None]] = None
+                 ) -> None:
+        self.expanded: int = 0  # states whose successors were generated
+        self.generated: int = 0  # Nodes created
+        self.peak_nodes: int = 0  # most Nodes held in memory at once
+        self.iterations: int = 0  # depth-first passes made by IDA*
+        self.budget_exhausted: bool = False  # gave up because of the budget
+        self.pushed: int = 0  # frontier insertions, decrease-keys included
+        self.duplicates: int = 0  # successors that had already been reached
+        self.frontier_peak: int = 0  # largest frontier size
+        self.successors_time: float = 0.0  # seconds spent in successors
+        self.heuristic_time: float = 0.0  # seconds spent in heuristic
+        self.elapsed: float = 0.0  # wall time of the whole search
+        self.on_expand: Optional[Callable[[Any], None]] = on_expand
+        self.on_push: Optional[Callable[[Any], None]] = on_push
+        self.on_goal: Optional[Callable[[Any], None]] = on_goal
+
+    def expand(self, state: Any) -> None:
+        self.expanded += 1
+        if self.on_expand is not None:
+            self.on_expand(state)
+
+    def push(self, state: Any, frontier_size: int) -> None:
+        self.pushed += 1
+        if frontier_size > self.frontier_peak:
+            self.frontier_peak = frontier_size
+        if self.on_push is not None:
+            self.on_push(state)
+
+    def goal(self, state: Any) -> None:
+        if self.on_goal is not None:
+            self.on_goal(state)
+
+    def timed(self,
+              function: Callable[[T], Any],
+              attribute: str) -> Callable[[T], Any]:
+        # function with its running time added to the given counter
+        def _timed(state: T) -> Any:
+            began: float = perf_counter()
+            try:
+                return function(state)
+            finally:
+                setattr(self, attribute,
+                        getattr(self, attribute) + perf_counter() - began)
+        return _timed
+
+    def __repr__(self) -> str:
+        return (f"SearchStats(expanded={self.expanded}, "
+                f"generated={self.generated}, "
+                f"peak_nodes={self.peak_nodes}, "
+                f"iterations={self.iterations}, "
+                f"budget_exhausted={self.budget_exhausted}, "
+                f"pushed={self.pushed}, "
+                f"duplicates={self.duplicates}, "
+                f"frontier_peak={self.frontier_peak}, "
+                f"successors_time={self.successors_time:.6f}, "
+                f"heuristic_time={self.heuristic_time:.6f}, "
+                f"elapsed={self.elapsed:.6f})")
+
+
+def _finish(stats: SearchStats, began: float, nodes: int) -> None:
+    stats.elapsed = perf_counter() - began
+    stats.generated = nodes
+    stats.peak_nodes = max(stats.peak_nodes, nodes)
+
+
 def dfs(
         initial: T,
         goal_test: Callable[[T], bool],
-        successors: Callable[[T], List[T]]
+        successors: Callable[[T], List[T]],
+        stats: Optional[SearchStats] = None
 ) -> Optional[Node[T]]:
+    if stats is not None:
+        began: float = perf_counter()
+        successors = stats.timed(successors, 'successors_time')
+    # the search tree, frontier holds indices into it
+    arena: NodeArena[T] = NodeArena()
     # frontier is where we've yet to go
-    frontier: Stack[Node[T]] = Stack()
-    frontier.push(Node(initial, None))
+    frontier: Stack[int] = Stack()
+    frontier.push(arena.add(initial))
     # explored is where we've been
     explored: Set[T] = {initial}
 
     # keep going while there is more to explore
     while not frontier.empty:
-        current_node: Node[T] = frontier.pop()
-        current_state: T = current_node.state
+        current: int = frontier.pop()
+        current_state: T = arena.states[current]
         # if we found the goal, we're done
         if goal_test(current_state):
-            return current_node
+            if stats is not None:
+                _finish(stats, began, len(arena))
+                stats.goal(current_state)
+            return arena.to_node(current)
+        if stats is not None:
+            stats.expand(current_state)
         # check where we can go next and haven't explored yet
         for child in successors(current_state):
             if child in explored:
+                if stats is not None:
+                    stats.duplicates += 1
                 continue
             explored.add(child)
-            frontier.push(Node(child, current_node))
+            frontier.push(arena.add(child, current, arena.costs[current] + 1))
+            if stats is not None:
+                stats.push(child, len(frontier))
 
+    if stats is not None:
+        _finish(stats, began, len(arena))
     return None  # all thing explored without finding goal
 
 
 def bfs(
         initial: T,
         goal_test: Callable[[T], bool],
-        successors: Callable[[T], List[T]]
+        successors: Callable[[T], List[T]],
+        stats: Optional[SearchStats] = None
 ) -> Optional[Node[T]]:
+    if stats is not None:
+        began: float = perf_counter()
+        successors = stats.timed(successors, 'successors_time')
+    # the search tree, frontier holds indices into it
+    arena: NodeArena[T] = NodeArena()
     # frontier is the place to be explored
-    frontier: Queue[Node[T]] = Queue()
-    frontier.push(Node(initial, None))
+    frontier: Queue[int] = Queue()
+    frontier.push(arena.add(initial))
     # explored the visited places
     explored: Set[T] = {initial}
 
     # keep going while there is more to explore
     while not frontier.empty:
-        current_node: Node[T] = frontier.pop()
-        current_state: T = current_node.state
+        current: int = frontier.pop()
+        current_state: T = arena.states[current]
         # done if the goal is found
         if goal_test(current_state):
-            return current_node
+            if stats is not None:
+                _finish(stats, began, len(arena))
+                stats.goal(current_state)
+            return arena.to_node(current)
+        if stats is not None:
+            stats.expand(current_state)
         # check where to go next that has not been explored
         for child in successors(current_state):
             if child in explored:
+                if stats is not None:
+                    stats.duplicates += 1
                 continue
             explored.add(child)
-            frontier.push(Node(child, current_node))
+            frontier.push(arena.add(child, current, arena.costs[current] + 1))
+            if stats is not None:
+                stats.push(child, len(frontier))
 
+    if stats is not None:
+        _finish(stats, began, len(arena))
     return None  # returns this when the goal is not found
 
 
-def astar(
+def weighted_astar(
         initial: T,
         goal_test: Callable[[T], bool],
-        successors: Callable[[T], List[T]],
-        heuristic: Callable[[T], float]
+        successors: Callable[[T], Iterable[Tuple[T, float]]],
+        heuristic: Callable[[T], float],
+        stats: Optional[SearchStats] = None
 ) -> Optional[Node[T]]:
+    """
+    A* where successors yields (state, edge_cost) pairs. Each state has at
+    most one entry in the frontier and is expanded at most once, which is
+    optimal as long as the heuristic is consistent.
+    """
+    if stats is not None:
+        began: float = perf_counter()
+        successors = stats.timed(successors, 'successors_time')
+        heuristic = stats.timed(heuristic, 'heuristic_time')
     # frontier is where we've yet to go
-    frontier: PriorityQueue[Node[T]] = PriorityQueue()
+    frontier: IndexedPriorityQueue[T] = IndexedPriorityQueue()
     frontier.push(Node(initial, None, 0.0, heuristic(initial)))
-    # explored is where we've been
-    explored: Dict[T, float] = {initial: 0.0}
+    # closed is where we've been
+    closed: Set[T] = set()
+    generated: int = 1
 
     # keep going while there is more to explore
     while not frontier.empty:
@@ -203,19 +471,704 @@ def astar(
         current_state: T = current_node.state
         # if we found the goal, we are done
         if goal_test(current_state):
+            if stats is not None:
+                _finish(stats, began, generated)
+                stats.goal(current_state)
             return current_node
-        # check where we can go next and haven't explored
-        for child in successors(current_state):
-            # implement a more sophisticated cost function
-            new_cost: float = current_node.cost + 1
-            if child not in explored or explored[child] > new_cost:
-                explored[child] = new_cost
+        closed.add(current_state)
+        if stats is not None:
+            stats.expand(current_state)
+        # check where we can go next and haven't expanded yet
+        for child, edge_cost in successors(current_state):
+            if child in closed:
+                if stats is not None:
+                    stats.duplicates += 1
+                continue
+            new_cost: float = current_node.cost + edge_cost
+            queued: Optional[Node[T]] = frontier.get(child)
+            if queued is None:
                 frontier.push(Node(child, current_node, new_cost,
                                    heuristic(child)))
+            else:
+                if stats is not None:
+                    stats.duplicates += 1
+                if new_cost >= queued.cost:
+                    continue
+                frontier.decrease_key(Node(child, current_node, new_cost,
+                                           queued.heuristic))
+            generated += 1
+            if stats is not None:
+                stats.push(child, len(frontier))
 
+    if stats is not None:
+        _finish(stats, began, generated)
     return None  # went through everything and never found goal
 
 
+def astar(
+        initial: T,
+        goal_test: Callable[[T], bool],
+        successors: Callable[[T], List[T]],
+        heuristic: Callable[[T], float],
+        stats: Optional[SearchStats] = None
+) -> Optional[Node[T]]:
+    # every move costs 1
+    def unit_successors(state: T) -> Iterable[Tuple[T, float]]:
+        return [(child, 1.0) for child in successors(state)]
+
+    return weighted_astar(initial, goal_test, unit_successors, heuristic,
+                          stats)
+
+
+def ida_star(
+        initial: T,
+        goal_test: Callable[[T], bool],
+        successors: Callable[[T], List[T]],
+        heuristic: Callable[[T], float],
+        max_expansions: Optional[int] = None
+) -> Tuple[Optional[Node[T]], SearchStats]:
+    """
+    Iterative-deepening A* with unit move costs. Each pass is a depth-first
+    search bounded by f = cost + heuristic, so only the Nodes on the current
+    path are kept. Gives up once max_expansions states have been expanded.
+    """
+    stats: SearchStats = SearchStats()
+    root: Node[T] = Node(initial, None, 0.0, heuristic(initial))
+    stats.generated = 1
+    bound: float = root.heuristic
+
+    while True:
+        stats.iterations += 1
+        next_bound: float = float("inf")
+        # the current path, each Node with the successors still to try
+        path: List[Tuple[Node[T], Iterator[T]]] = []
+        on_path: Set[T] = set()
+        entering: Optional[Node[T]] = root
+        while True:
+            if entering is not None:
+                f: float = entering.cost + entering.heuristic
+                if f > bound:
+                    next_bound = min(next_bound, f)
+                elif goal_test(entering.state):
+                    return entering, stats
+                elif max_expansions is not None and \
+                        stats.expanded >= max_expansions:
+                    stats.budget_exhausted = True
+                    return None, stats
+                else:
+                    stats.expanded += 1
+                    path.append((entering, iter(successors(entering.state))))
+                    on_path.add(entering.state)
+                    stats.peak_nodes = max(stats.peak_nodes, len(path))
+            if not path:
+                break
+            current_node, children = path[-1]
+            entering = None
+            for child in children:
+                if child not in on_path:  # no cycles along the path
+                    entering = Node(child, current_node,
+                                    current_node.cost + 1, heuristic(child))
+                    stats.generated += 1
+                    break
+            else:
+                path.pop()
+                on_path.discard(current_node.state)
+        if next_bound == float("inf"):
+            return None, stats  # nothing was cut off, there is no goal
+        bound = next_bound
+
+
+class _BoundedNode(Node[T]):
+    # a Node of the tree kept by sma_star, which may forget subtrees
+    __slots__ = ('depth', 'f', 'successors', 'children', 'forgotten',
+                 'version', 'queued', 'leaf_version')
+
+    def __init__(self,
+                 state: T,
+                 parent: Optional[_BoundedNode[T]],
+                 heuristic: float
+                 ) -> None:
+        cost: float = 0.0 if parent is None else parent.cost + 1
+        super().__init__(state, parent, cost, heuristic)
+        self.depth: int = 0 if parent is None else parent.depth + 1
+        # backed-up estimate, never below the parent's (pathmax)
+        self.f: float = cost + heuristic if parent is None else \
+            max(parent.f, cost + heuristic)
+        self.successors: Optional[List[T]] = None
+        self.children: Dict[T, _BoundedNode[T]] = {}
+        self.forgotten: Dict[T, float] = {}  # f of dropped children
+        self.version: int = 0  # bumped to invalidate older heap entries
+        self.queued: bool = False
+        self.leaf_version: int = 0  # the same, for the heap of leaves
+
+
+def sma_star(
+        initial: T,
+        goal_test: Callable[[T], bool],
+        successors: Callable[[T], List[T]],
+        heuristic: Callable[[T], float],
+        max_nodes: int
+) -> Tuple[Optional[Node[T]], SearchStats]:
+    """
+    Simplified memory-bounded A* with unit move costs. At most max_nodes
+    Nodes are kept: when memory is full the shallowest leaf with the highest
+    f is forgotten and its f is backed up into its parent, which regenerates
+    it only once everything else looks worse; a child that cannot be made
+    room for is dropped as unreachable. The result is optimal when a
+    shortest path fits within max_nodes Nodes.
+    """
+    if max_nodes < 1:
+        raise ValueError("max_nodes must be at least 1")
+    stats: SearchStats = SearchStats()
+    tie: Iterator[int] = count()
+    # queued Nodes, lowest f and deepest first, and the leaves that can be
+    # forgotten, highest f and shallowest first; only the newest entry of
+    # a Node is valid, so a forget pops past stale entries only
+    best_first: List[tuple] = []
+    worst_leaves: List[tuple] = []
+
+    def enqueue(node: _BoundedNode[T]) -> None:
+        node.version += 1
+        node.queued = True
+        heappush(best_first, (node.f, -node.depth, next(tie), node.version,
+                              node))
+
+    def dequeue(node: _BoundedNode[T]) -> None:
+        node.version += 1
+        node.queued = False
+
+    def update_leaf(node: _BoundedNode[T]) -> None:
+        # called whenever node gains or loses children or changes f; the
+        # root is never forgotten
+        node.leaf_version += 1
+        if not node.children and node.parent is not None:
+            heappush(worst_leaves, (-node.f, node.depth, next(tie),
+                                    node.leaf_version, node))
+
+    def backup(node: Optional[_BoundedNode[T]]) -> None:
+        # once every successor has been generated, a node is as good as its
+        # best child, remembered or forgotten
+        while node is not None and node.successors is not None and \
+                len(node.children) + len(node.forgotten) == \
+                len(node.successors):
+            f: float = min([child.f for child in node.children.values()] +
+                           list(node.forgotten.values()),
+                           default=float("inf"))
+            if f == node.f:
+                return
+            node.f = f
+            if node.queued:
+                enqueue(node)
+            if not node.children:
+                update_leaf(node)
+            node = node.parent
+
+    def forget(node: _BoundedNode[T]) -> None:
+        parent: _BoundedNode[T] = node.parent
+        del parent.children[node.state]
+        parent.forgotten[node.state] = node.f
+        dequeue(node)
+        node.leaf_version += 1
+        if not parent.children:
+            update_leaf(parent)
+        if not parent.queued:
+            enqueue(parent)
+        backup(parent)
+
+    def forget_worst_leaf() -> bool:
+        while worst_leaves:
+            entry: tuple = heappop(worst_leaves)
+            node: _BoundedNode[T] = entry[-1]
+            if entry[3] == node.leaf_version:
+                forget(node)
+                return True
+        return False
+
+    root: _BoundedNode[T] = _BoundedNode(initial, None, heuristic(initial))
+    stats.generated = stats.peak_nodes = in_memory = 1
+    limited: bool = False  # whether memory ever cut the search short
+    enqueue(root)
+
+    while best_first:
+        entry: tuple = best_first[0]
+        best: _BoundedNode[T] = entry[-1]
+        if entry[3] != best.version:
+            heappop(best_first)
+            continue
+        if best.f == float("inf"):
+            break  # nothing left that fits in memory
+        if goal_test(best.state):
+            return best, stats
+        if best.successors is None:
+            stats.expanded += 1
+            ancestors: Set[T] = set()
+            node: Optional[Node[T]] = best
+            while node is not None:
+                ancestors.add(node.state)
+                node = node.parent
+            best.successors = [child for child in successors(best.state)
+                               if child not in ancestors]
+            if not best.successors:  # dead end, drop it from memory
+                best.f = float("inf")
+                if best.parent is None:
+                    break
+                forget(best)
+                in_memory -= 1
+                continue
+        # successors never generated come first, then the most promising
+        # forgotten one, unless that can only lead to dead ends
+        child_state: Optional[T] = next(
+            (state for state in best.successors
+             if state not in best.children and state not in best.forgotten),
+            None)
+        if child_state is None:
+            child_state = min(best.forgotten, key=best.forgotten.__getitem__)
+            if best.forgotten[child_state] == float("inf"):
+                dequeue(best)
+                continue
+        child: _BoundedNode[T] = _BoundedNode(child_state, best,
+                                              heuristic(child_state))
+        # a forgotten child keeps the estimate it was forgotten with
+        child.f = max(child.f, best.forgotten.pop(child_state, child.f))
+        stats.generated += 1
+        if child.depth >= max_nodes - 1 and not goal_test(child_state):
+            child.f = float("inf")  # its path could not fit in memory
+            limited = True
+        best.children[child_state] = child
+        if len(best.children) == 1:
+            update_leaf(best)  # no longer a leaf
+        if len(best.children) == len(best.successors):
+            dequeue(best)  # nothing left to generate from best
+        if in_memory >= max_nodes:
+            limited = True
+            if not forget_worst_leaf():
+                # every Node in memory is needed, so the child cannot be
+                # kept: it is forgotten straight away as unreachable
+                del best.children[child_state]
+                best.forgotten[child_state] = float("inf")
+                if not best.children:
+                    update_leaf(best)
+                if not best.queued:
+                    enqueue(best)
+                backup(best)
+                continue
+        else:
+            in_memory += 1
+            stats.peak_nodes = max(stats.peak_nodes, in_memory)
+        enqueue(child)
+        update_leaf(child)
+        backup(best)
+
+    stats.budget_exhausted = limited
+    return None, stats
+
+
+class SearchProgress(NamedTuple):
+    """What a generator search reports between steps"""
+    expanded: int  # states expanded so far
+    frontier_size: int
+    solution: Optional[Node]  # best solution found so far
+    done: bool  # no further reports will follow
+
+
+def iter_bfs(
+        initial: T,
+        goal_test: Callable[[T], bool],
+        successors: Callable[[T], List[T]],
+        report_every: int = 1000
+) -> Iterator[SearchProgress]:
+    """
+    bfs as a generator, reporting progress every report_every expansions
+    and finally with the solution (or None) and done set. The search can be
+    abandoned between reports simply by no longer iterating.
+    """
+    arena: NodeArena[T] = NodeArena()
+    frontier: Queue[int] = Queue()
+    frontier.push(arena.add(initial))
+    explored: Set[T] = {initial}
+    expanded: int = 0
+
+    while not frontier.empty:
+        current: int = frontier.pop()
+        current_state: T = arena.states[current]
+        if goal_test(current_state):
+            yield SearchProgress(expanded, len(frontier),
+                                 arena.to_node(current), True)
+            return
+        expanded += 1
+        for child in successors(current_state):
+            if child in explored:
+                continue
+            explored.add(child)
+            frontier.push(arena.add(child, current, arena.costs[current] + 1))
+        if expanded % report_every == 0:
+            yield SearchProgress(expanded, len(frontier), None, False)
+
+    yield SearchProgress(expanded, 0, None, True)
+
+
+def iter_astar(
+        initial: T,
+        goal_test: Callable[[T], bool],
+        successors: Callable[[T], List[T]],
+        heuristic: Callable[[T], float],
+        report_every: int = 1000
+) -> Iterator[SearchProgress]:
+    """astar as a generator, reporting progress like iter_bfs"""
+    return anytime_astar(initial, goal_test, successors, heuristic, (1.0,),
+                         report_every)
+
+
+def anytime_astar(
+        initial: T,
+        goal_test: Callable[[T], bool],
+        successors: Callable[[T], List[T]],
+        heuristic: Callable[[T], float],
+        weights: Sequence[float] = (3.0, 2.0, 1.5, 1.0),
+        report_every: int = 1000
+) -> Iterator[SearchProgress]:
+    """
+    Anytime A* with unit move costs: a weighted A* pass (f = cost +
+    weight * heuristic) for each of the decreasing weights. A pass finds a
+    path at most weight times longer than the shortest quickly; every pass
+    prunes states that cannot beat the best path so far and each improved
+    path is reported as soon as it is found. After a pass with weight 1.0
+    the best path is optimal, given an admissible heuristic.
+    """
+    best: Optional[Node[T]] = None
+    expanded: int = 0
+    for weight in weights:
+        frontier: IndexedPriorityQueue[T] = IndexedPriorityQueue()
+        h: float = heuristic(initial)
+        frontier.push(Node(initial, None, 0.0, weight * h))
+        closed: Set[T] = set()
+        while not frontier.empty:
+            current_node: Node[T] = frontier.pop()
+            current_state: T = current_node.state
+            if best is not None and current_node.cost + \
+                    current_node.heuristic / weight >= best.cost:
+                continue  # cannot lead to a shorter path than best
+            if goal_test(current_state):
+                best = current_node
+                yield SearchProgress(expanded, len(frontier), best, False)
+                break  # on to the next, smaller weight
+            closed.add(current_state)
+            expanded += 1
+            new_cost: float = current_node.cost + 1
+            for child in successors(current_state):
+                if child in closed:
+                    continue
+                queued: Optional[Node[T]] = frontier.get(child)
+                if queued is None:
+                    h = heuristic(child)
+                    if best is None or new_cost + h < best.cost:
+                        frontier.push(Node(child, current_node, new_cost,
+                                           weight * h))
+                elif new_cost < queued.cost:
+                    frontier.decrease_key(Node(child, current_node, new_cost,
+                                               queued.heuristic))
+            if expanded % report_every == 0:
+                yield SearchProgress(expanded, len(frontier), best, False)
+    yield SearchProgress(expanded, 0, best, True)
+
+
+async def search_async(
+        search: Iterator[SearchProgress],
+        time_limit: Optional[float] = None
+) -> Optional[Node]:
+    """
+    Drives a generator search from a coroutine, handing control back to
+    the event loop after every progress report (every report_every
+    expansions). With a time_limit in seconds it stops there and returns
+    the best solution found so far, if any.
+    """
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    deadline: Optional[float] = None if time_limit is None else \
+        loop.time() + time_limit
+    best: Optional[Node] = None
+    try:
+        for progress in search:
+            if progress.solution is not None:
+                best = progress.solution
+            if progress.done or \
+                    (deadline is not None and loop.time() >= deadline):
+                break
+            await asyncio.sleep(0)
+    finally:
+        close: Optional[Callable[[], None]] = getattr(search, 'close', None)
+        if close is not None:
+            close()
+    return best
+
+
+def _join_paths(forward: List[T], backward: List[T]) -> Node[T]:
+    # forward runs from the meeting state back to initial, backward from the
+    # meeting state on to goal; both start with the meeting state
+    node: Optional[Node[T]] = None
+    for cost, state in enumerate(forward[::-1] + backward[1:]):
+        node = Node(state, node, float(cost))
+    return node
+
+
+def _expand_layer(
+        layer: List[T],
+        reached: Dict[T, Optional[T]],
+        other: Dict[T, Optional[T]],
+        neighbours: Callable[[T], List[T]]
+) -> Tuple[List[T], Optional[T]]:
+    next_layer: List[T] = []
+    for state in layer:
+        for child in neighbours(state):
+            if child in reached:
+                continue
+            reached[child] = state
+            # with whole layers expanded, the first meeting is a shortest one
+            if child in other:
+                return next_layer, child
+            next_layer.append(child)
+    return next_layer, None
+
+
+def _chain(reached: Dict[T, Optional[T]], state: T) -> List[T]:
+    states: List[T] = [state]
+    while reached[states[-1]] is not None:
+        states.append(reached[states[-1]])
+    return states
+
+
+def bidirectional_bfs(
+        initial: T,
+        goal: T,
+        successors: Callable[[T], List[T]],
+        predecessors: Callable[[T], List[T]]
+) -> Optional[Node[T]]:
+    """
+    Breadth-first search from initial and from goal at once, always growing
+    the smaller frontier by one whole layer, until the two searches meet.
+    predecessors(s) lists the states that have s as a successor; for
+    reversible moves it is simply successors.
+    """
+    if initial == goal:
+        return Node(initial, None)
+    # each side maps a reached state to the one it was reached from
+    forward: Dict[T, Optional[T]] = {initial: None}
+    backward: Dict[T, Optional[T]] = {goal: None}
+    forward_layer: List[T] = [initial]
+    backward_layer: List[T] = [goal]
+
+    while forward_layer and backward_layer:
+        if len(forward_layer) <= len(backward_layer):
+            forward_layer, meeting = _expand_layer(forward_layer, forward,
+                                                   backward, successors)
+        else:
+            backward_layer, meeting = _expand_layer(backward_layer, backward,
+                                                    forward, predecessors)
+        if meeting is not None:
+            return _join_paths(_chain(forward, meeting),
+                               _chain(backward, meeting))
+
+    return None  # one side ran out of states, initial and goal never meet
+
+
+def bidirectional_astar(
+        initial: T,
+        goal: T,
+        successors: Callable[[T], List[T]],
+        predecessors: Callable[[T], List[T]],
+        heuristic: Callable[[T], float],
+        reverse_heuristic: Callable[[T], float]
+) -> Optional[Node[T]]:
+    """
+    A* from both ends with unit move costs. heuristic estimates the distance
+    to goal and reverse_heuristic the distance from initial; with consistent
+    heuristics the search stops as soon as either frontier can no longer
+    improve on the best meeting found, which is then a shortest path.
+    """
+    if initial == goal:
+        return Node(initial, None)
+    frontiers: List[IndexedPriorityQueue[T]] = [IndexedPriorityQueue(),
+                                                IndexedPriorityQueue()]
+    # best Node found so far for every state each side has reached
+    reached: List[Dict[T, Node[T]]] = [{}, {}]
+    closed: List[Set[T]] = [set(), set()]
+    neighbours: List[Callable[[T], List[T]]] = [successors, predecessors]
+    heuristics: List[Callable[[T], float]] = [heuristic, reverse_heuristic]
+    for side, state in ((0, initial), (1, goal)):
+        reached[side][state] = Node(state, None, 0.0, heuristics[side](state))
+        frontiers[side].push(reached[side][state])
+    best_cost: float = float("inf")
+    meeting: Optional[T] = None
+
+    while not frontiers[0].empty and not frontiers[1].empty:
+        top_forward: Node[T] = frontiers[0].peek()
+        top_backward: Node[T] = frontiers[1].peek()
+        if max(top_forward.cost + top_forward.heuristic,
+               top_backward.cost + top_backward.heuristic) >= best_cost:
+            break
+        side: int = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        own: Dict[T, Node[T]] = reached[side]
+        other: Dict[T, Node[T]] = reached[1 - side]
+        current_node: Node[T] = frontiers[side].pop()
+        closed[side].add(current_node.state)
+        new_cost: float = current_node.cost + 1
+        for child in neighbours[side](current_node.state):
+            if child in closed[side]:
+                continue
+            known: Optional[Node[T]] = own.get(child)
+            if known is None:
+                own[child] = Node(child, current_node, new_cost,
+                                  heuristics[side](child))
+                frontiers[side].push(own[child])
+            elif new_cost < known.cost:
+                own[child] = Node(child, current_node, new_cost,
+                                  known.heuristic)
+                frontiers[side].decrease_key(own[child])
+            else:
+                continue
+            # a state reached from both ends joins initial to goal
+            if child in other and new_cost + other[child].cost < best_cost:
+                best_cost = new_cost + other[child].cost
+                meeting = child
+
+    if meeting is None:
+        return None
+    return _join_paths(node_to_path(reached[0][meeting])[::-1],
+                       node_to_path(reached[1][meeting])[::-1])
+
+
+def _grid_path(parent: Sequence[int],
+               goal: int,
+               to_state: Callable[[int], T]) -> Node[T]:
+    # only the cells on the path become Nodes, walking the parent array back
+    indices: List[int] = [goal]
+    while parent[indices[-1]] != indices[-1]:
+        indices.append(parent[indices[-1]])
+    indices.reverse()
+    node: Optional[Node[T]] = None
+    for cost, index in enumerate(indices):
+        node = Node(to_state(index), node, float(cost))
+    return node
+
+
+def _grid_arrays(grid: Sequence[int], start: int) -> array:
+    if len(grid) >= 2 ** 31:
+        raise ValueError("Grid too large for 32-bit cell indices")
+    parent: array = array('i', [-1]) * len(grid)
+    parent[start] = start
+    return parent
+
+
+def grid_bfs(
+        grid: Sequence[int],
+        columns: int,
+        start: int,
+        goal: int,
+        blocked: int,
+        to_state: Callable[[int], T]
+) -> Optional[Node[T]]:
+    """
+    Breadth-first search over a flat row-major grid of cell bytes, where
+    states are integer cell indices and 4-connected moves cost 1. The parent
+    array doubles as the explored set, so no per-cell objects are allocated;
+    the returned Node chain holds to_state(index) for the path cells only.
+    """
+    size: int = len(grid)
+    parent: array = _grid_arrays(grid, start)
+    last_column: int = columns - 1
+    frontier: Deque[int] = deque([start])
+
+    while frontier:
+        current: int = frontier.popleft()
+        if current == goal:
+            return _grid_path(parent, goal, to_state)
+        column: int = current % columns
+        # same neighbour order as Maze.successors: down, up, right, left
+        child: int = current + columns
+        if child < size and parent[child] == -1 and grid[child] != blocked:
+            parent[child] = current
+            frontier.append(child)
+        child = current - columns
+        if child >= 0 and parent[child] == -1 and grid[child] != blocked:
+            parent[child] = current
+            frontier.append(child)
+        child = current + 1
+        if column < last_column and parent[child] == -1 and \
+                grid[child] != blocked:
+            parent[child] = current
+            frontier.append(child)
+        child = current - 1
+        if column > 0 and parent[child] == -1 and grid[child] != blocked:
+            parent[child] = current
+            frontier.append(child)
+
+    return None
+
+
+def grid_astar(
+        grid: Sequence[int],
+        columns: int,
+        start: int,
+        goal: int,
+        blocked: int,
+        to_state: Callable[[int], T]
+) -> Optional[Node[T]]:
+    """
+    A* counterpart of grid_bfs using the Manhattan distance to goal. Costs
+    and parents live in preallocated arrays and the heap holds plain
+    (f, h, index) tuples; stale heap entries are skipped on pop.
+    """
+    size: int = len(grid)
+    parent: array = _grid_arrays(grid, start)
+    cost: array = array('i', [size]) * size  # size is larger than any path
+    closed: bytearray = bytearray(size)
+    goal_row, goal_column = divmod(goal, columns)
+    last_column: int = columns - 1
+    cost[start] = 0
+    start_row, start_column = divmod(start, columns)
+    h: int = abs(start_row - goal_row) + abs(start_column - goal_column)
+    frontier: List[tuple] = [(h, h, start)]
+
+    while frontier:
+        current: int = heappop(frontier)[2]
+        if closed[current]:
+            continue  # stale entry, a cheaper one was already expanded
+        if current == goal:
+            return _grid_path(parent, goal, to_state)
+        closed[current] = 1
+        new_cost: int = cost[current] + 1
+        row, column = divmod(current, columns)
+        row_h: int = abs(row - goal_row)
+        column_h: int = abs(column - goal_column)
+        # same neighbour order as Maze.successors: down, up, right, left
+        child: int = current + columns
+        if child < size and new_cost < cost[child] and grid[child] != blocked:
+            cost[child] = new_cost
+            parent[child] = current
+            h = abs(row + 1 - goal_row) + column_h
+            heappush(frontier, (new_cost + h, h, child))
+        child = current - columns
+        if child >= 0 and new_cost < cost[child] and grid[child] != blocked:
+            cost[child] = new_cost
+            parent[child] = current
+            h = abs(row - 1 - goal_row) + column_h
+            heappush(frontier, (new_cost + h, h, child))
+        child = current + 1
+        if column < last_column and new_cost < cost[child] and \
+                grid[child] != blocked:
+            cost[child] = new_cost
+            parent[child] = current
+            h = row_h + abs(column + 1 - goal_column)
+            heappush(frontier, (new_cost + h, h, child))
+        child = current - 1
+        if column > 0 and new_cost < cost[child] and grid[child] != blocked:
+            cost[child] = new_cost
+            parent[child] = current
+            h = row_h + abs(column - 1 - goal_column)
+            heappush(frontier, (new_cost + h, h, child))
+
+    return None
+
+
 def node_to_path(node: Node[T]) -> List[T]:
     path: List[T] = [node.state]
     # work backwards from end to front
@@ -226,6 +1179,57 @@ def node_to_path(node: Node[T]) -> List[T]:
     return path
 
 
+def _solve_chunk(
+        algorithm: Callable[..., Optional[Node[T]]],
+        chunk: List[Tuple[int, Callable[[], Sequence[Any]]]]
+) -> List[Tuple[int, Optional[List[T]]]]:
+    # runs in a worker process: problems are built here, only paths go back
+    results: List[Tuple[int, Optional[List[T]]]] = []
+    for index, problem in chunk:
+        solution: Optional[Node[T]] = algorithm(*problem())
+        results.append((index, None if solution is None
+                        else node_to_path(solution)))
+    return results
+
+
+def solve_many(
+        problems: Iterable[Callable[[], Sequence[Any]]],
+        algorithm: Callable[..., Optional[Node[T]]],
+        workers: Optional[int] = None,
+        chunksize: int = 8
+) -> Iterator[Tuple[int, Optional[List[T]]]]:
+    """
+    Solves independent search problems on a pool of worker processes. Each
+    problem is a small picklable callable returning the arguments for
+    algorithm, e.g. (initial, goal_test, successors) for bfs, and is only
+    built inside the worker. Problems are sent in chunks, at most two per
+    worker in flight, and (position in problems, node_to_path result or
+    None) pairs are yielded as chunks finish, so not in input order.
+    """
+    workers = workers or cpu_count() or 1
+    numbered: Iterator[Tuple[int, Callable[[], Sequence[Any]]]] = \
+        enumerate(problems)
+    executor: ProcessPoolExecutor = ProcessPoolExecutor(workers)
+    pending: Set[Future] = set()
+    try:
+        while True:
+            while len(pending) < 2 * workers:
+                chunk: List[Tuple[int, Callable[[], Sequence[Any]]]] = \
+                    list(islice(numbered, chunksize))
+                if not chunk:
+                    break
+                pending.add(executor.submit(_solve_chunk, algorithm, chunk))
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+    finally:
+        # chunks are still pending only if the caller stopped early: drop
+        # those not started and do not wait for those running
+        executor.shutdown(wait=not pending, cancel_futures=True)
+
+
 if __name__ == "__main__":
     print(linear_search([1, 5, 15, 15, 15, 15, 20], 5))  # True
     print(binary_search(['a', 'd', 'e', 'f', 'z'], 'f'))  # True
@@ -1,6 +1,9 @@
-from typing import TypeVar, Generic, List
+from typing import TypeVar, Generic, Dict, Iterator, List, Sequence, Tuple
 T = TypeVar('T')
 
+# a move is (disc, from peg, to peg), discs numbered from 1 for the smallest
+Move = Tuple[int, int, int]
+
 class Stack(Generic[T]):
 
     def __init__(self) -> None:
@@ -16,14 +19,6 @@ class Stack(Generic[T]):
         return repr(self._container)
 
 
-num_discs : int = 3
-tower_a : Stack[int] = Stack()
-tower_b : Stack[int] = Stack()
-tower_c : Stack[int] = Stack()
-for i in range(1, num_discs + 1):
-    tower_a.push(i)
-
-
 def hanoi(begin: Stack[int], end: Stack[int], temp: Stack[int], n: int) -> None:
     """
     The recursive algorithm:
@@ -38,10 +33,116 @@ def hanoi(begin: Stack[int], end: Stack[int], temp: Stack[int], n: int) -> None:
         hanoi(begin, end, temp, 1)
         hanoi(temp, end, begin, n - 1)
 
+
+def hanoi_moves(n: int, begin: int = 0, end: int = 2, temp: int = 1) \
+        -> Iterator[Move]:
+    """
+    The moves of hanoi, one at a time and without recursion: move m moves
+    disc number (trailing zeros of m) + 1, from peg (m & m - 1) % 3 to
+    peg ((m | m - 1) + 1) % 3. Those pegs take the tower from 0 to 2 for
+    odd n and from 0 to 1 for even n, and are renamed to begin, end, temp.
+    """
+    pegs: Tuple[int, int, int] = (begin, end, temp) if n % 2 == 0 \
+        else (begin, temp, end)
+    for m in range(1, 2 ** n):
+        yield ((m & -m).bit_length(),
+               pegs[(m & m - 1) % 3],
+               pegs[((m | m - 1) + 1) % 3])
+
+
+def hanoi_state(n: int, k: int, begin: int = 0, end: int = 2,
+                temp: int = 1) -> List[List[int]]:
+    """
+    The discs on each peg after the first k moves of hanoi_moves, bottom
+    first, worked out in O(n) from the bits of k: the largest disc has
+    moved iff k passed the 2^(n-1) - 1 moves of the discs above it.
+    """
+    if not 0 <= k < 2 ** n:
+        raise ValueError("k must be between 0 and 2^n - 1")
+    towers: List[List[int]] = [[] for _ in range(max(begin, end, temp) + 1)]
+    for disc in range(n, 0, -1):
+        half: int = 2 ** (disc - 1)
+        if k < half:
+            # the disc has not moved, the ones above go to temp first
+            towers[begin].append(disc)
+            end, temp = temp, end
+        else:
+            # the disc is on end, the ones above come over from temp
+            towers[end].append(disc)
+            k -= half
+            begin, temp = temp, begin
+    return towers
+
+
+# Frame-Stewart with p pegs: the best number of moves for n discs and the
+# number k of the smallest discs that first go to a spare peg, for each n
+# computed so far, by number of pegs
+_frame_stewart: Dict[int, List[Tuple[int, int]]] = {}
+
+
+def frame_stewart(n: int, pegs: int = 4) -> Tuple[int, int]:
+    """
+    (moves, k) for n discs and pegs pegs: move the k smallest discs to a
+    spare peg using every peg, the other n - k to the end without that
+    peg, then the k on top of them. Computed bottom up and kept.
+    """
+    if pegs < 3:
+        raise ValueError("Frame-Stewart needs at least 3 pegs")
+    for p in range(3, pegs + 1):
+        table: List[Tuple[int, int]] = _frame_stewart.setdefault(p, [(0, 0)])
+        while len(table) <= n:
+            discs: int = len(table)
+            if p == 3:
+                table.append((2 ** discs - 1, discs - 1))
+            else:
+                fewer: List[Tuple[int, int]] = _frame_stewart[p - 1]
+                table.append(min((2 * table[k][0] + fewer[discs - k][0], k)
+                                 for k in range(1, discs)) if discs > 1
+                             else (1, 0))
+    return _frame_stewart[pegs][n]
+
+
+def frame_stewart_moves(n: int, pegs: Sequence[int] = (0, 3, 1, 2)) \
+        -> Iterator[Move]:
+    """
+    The moves of a Frame-Stewart solution taking n discs from pegs[0] to
+    pegs[1] with the others as spares, from an explicit stack of
+    subproblems rather than recursion
+    """
+    # (discs, number of the smallest disc less one, pegs: begin, end, spares)
+    stack: List[Tuple[int, int, Tuple[int, ...]]] = [(n, 0, tuple(pegs))]
+    while stack:
+        discs, offset, order = stack.pop()
+        if discs == 0:
+            continue
+        if len(order) == 3:
+            for disc, source, target in hanoi_moves(discs, order[0],
+                                                    order[1], order[2]):
+                yield disc + offset, source, target
+            continue
+        _, k = frame_stewart(discs, len(order))
+        begin, end, spare = order[0], order[1], order[2]
+        rest: Tuple[int, ...] = order[3:]
+        # pushed in reverse: k aside, the rest across, the k back on top
+        stack.append((k, offset, (spare, end, begin) + rest))
+        stack.append((discs - k, offset + k, (begin, end) + rest))
+        stack.append((k, offset, (begin, spare, end) + rest))
+
+
 if __name__ == "__main__":
+    num_discs : int = 3
+    tower_a : Stack[int] = Stack()
+    tower_b : Stack[int] = Stack()
+    tower_c : Stack[int] = Stack()
+    for i in range(1, num_discs + 1):
+        tower_a.push(i)
     hanoi(tower_a, tower_c, tower_b, num_discs)
     print(tower_a)
     print(tower_b)
     print(tower_c)
+    # 2^64 - 1 moves, but only the ones asked for are computed
+    print(hanoi_state(64, 2 ** 63))
+    print(frame_stewart(64, 4))
+    print(list(frame_stewart_moves(3, (0, 3, 1, 2))))
 
 
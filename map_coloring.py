@@ -1,22 +1,15 @@
-from generic_funcs.csp import Constraint, CSP
+from generic_funcs.csp import NotEqualConstraint, CSP
 from typing import Dict, List, Optional
 
 
-class MapColoringConstraint(Constraint[str, str]):
+class MapColoringConstraint(NotEqualConstraint[str, str]):
+    # the colors of two bordering places must differ; satisfied is inherited
+    # so that the CSP can check these through its not-equal fast path
     def __init__(self, place_1: str, place_2: str):
-        super().__init__([place_1, place_2])
+        super().__init__(place_1, place_2)
         self.place_1: str = place_1
         self.place_2: str = place_2
 
-    def satisfied(self, assignment: Dict[str, str]) -> bool:
-        # If either place is not in the assignment, then it is not yet
-        # possible for their colors to be conflicting
-        if self.place_1 not in assignment or self.place_2 not in assignment:
-            return True
-        # check the color assigned to place_1 is not the same as the color
-        # assigned to place_2
-        return assignment[self.place_1] != assignment[self.place_2]
-
 
 if __name__ == "__main__":
     # the variables
@@ -59,3 +52,6 @@ if __name__ == "__main__":
         print("No solution found!")
     else:
         print(solution)
+
+    # once Victoria has a color, Tasmania is counted on its own
+    print(f"{csp.count_solutions()} solutions")
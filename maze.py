@@ -1,18 +1,26 @@
 import random
+from array import array
+from collections import OrderedDict, deque
 from enum import Enum
+from heapq import heappush, heappop
 from math import sqrt
 from typing import \
     Dict, \
     List, \
     NamedTuple, \
     Callable, \
-    Optional
+    Optional, \
+    Tuple, \
+    Deque
 from generic_funcs.generic_search import \
     dfs, \
     bfs, \
     astar, \
+    grid_bfs, \
+    grid_astar, \
     node_to_path, \
-    Node
+    Node, \
+    SearchStats
 
 
 class Cell(str, Enum):
@@ -23,6 +31,10 @@ class Cell(str, Enum):
     PATH = "*"
 
 
+# the grid stores each cell as the byte of its value, one byte per cell
+_BLOCKED: int = ord(Cell.BLOCKED.value)
+
+
 class MazeLocation(NamedTuple):
     row: int
     column: int
@@ -34,33 +46,56 @@ class Maze:
                  columns: int = 10,
                  sparseness: float = 0.2,
                  start: MazeLocation = MazeLocation(0, 0),
-                 goal: MazeLocation = MazeLocation(9, 9)
+                 goal: MazeLocation = MazeLocation(9, 9),
+                 seed: Optional[int] = None
                  ) -> None:
         # initialize basic instance variables 
         self._rows: int = rows
         self._columns: int = columns
         self.start: MazeLocation = start
         self.goal: MazeLocation = goal
-        # fill the grid with empty cells 
-        self._grid: List[List[Cell]] = [[Cell.EMPTY for _ in range(columns)]
-                                        for _ in range(rows)]
-        # populate the grid with blocked cells 
-        self._randomly_fill(rows, columns, sparseness)
+        # bumped whenever the set of blocked cells changes
+        self._version: int = 0
+        # fill the flat row-major grid with empty cells
+        self._grid: bytearray = bytearray(Cell.EMPTY.value.encode()) * \
+            (rows * columns)
+        # populate the grid with blocked cells, reproducibly if seeded
+        self._randomly_fill(rows, columns, sparseness,
+                            random if seed is None else random.Random(seed))
         # fill the start and goal locations in
-        self._grid[start.row][start.column] = Cell.START
-        self._grid[goal.row][goal.column] = Cell.GOAL
+        self._set(start, Cell.START)
+        self._set(goal, Cell.GOAL)
+
+    def _randomly_fill(self, rows: int, columns: int, sparseness: float,
+                       rng=random):
+        for index in range(rows * columns):
+            if rng.uniform(0, 1.0) < sparseness:
+                self._grid[index] = _BLOCKED
+
+    def _set(self, ml: MazeLocation, cell: Cell) -> None:
+        index: int = self.index(ml)
+        value: int = ord(cell.value)
+        if (self._grid[index] == _BLOCKED) != (value == _BLOCKED):
+            self._version += 1
+        self._grid[index] = value
 
-    def _randomly_fill(self, rows: int, columns: int, sparseness: float):
-        for row in range(rows):
-            for column in range(columns):
-                if random.uniform(0, 1.0) < sparseness:
-                    self._grid[row][column] = Cell.BLOCKED
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def set_blocked(self, ml: MazeLocation, blocked: bool = True) -> None:
+        self._set(ml, Cell.BLOCKED if blocked else Cell.EMPTY)
 
     def __str__(self) -> str:
-        output: str = ""
-        for row in self._grid:
-            output += "".join([c.value for c in row]) + "\n"
-        return output
+        text: str = self._grid.decode()
+        return "".join(text[start:start + self._columns] + "\n"
+                       for start in range(0, len(text), self._columns))
+
+    def index(self, ml: MazeLocation) -> int:
+        return ml.row * self._columns + ml.column
+
+    def location(self, index: int) -> MazeLocation:
+        return MazeLocation(*divmod(index, self._columns))
 
     def goal_test(self, ml: MazeLocation) -> bool:
         return ml == self.goal
@@ -68,31 +103,298 @@ class Maze:
     def successors(self, ml: MazeLocation) -> List[MazeLocation]:
         # noinspection PyCompatibility
         locations: List[MazeLocation] = []
-        if ml.row + 1 < self._rows and self._grid[ml.row + 1][ml.column] != \
-                Cell.BLOCKED:
+        grid: bytearray = self._grid
+        columns: int = self._columns
+        index: int = ml.row * columns + ml.column
+        if ml.row + 1 < self._rows and grid[index + columns] != _BLOCKED:
             locations.append(MazeLocation(ml.row + 1, ml.column))
-        if ml.row - 1 >= 0 and self._grid[ml.row - 1][ml.column] != \
-                Cell.BLOCKED:
+        if ml.row - 1 >= 0 and grid[index - columns] != _BLOCKED:
             locations.append(MazeLocation(ml.row - 1, ml.column))
-        if ml.column + 1 < self._columns and \
-                self._grid[ml.row][ml.column + 1] != Cell.BLOCKED:
+        if ml.column + 1 < columns and grid[index + 1] != _BLOCKED:
             locations.append(MazeLocation(ml.row, ml.column + 1))
-        if ml.column - 1 >= 0 and self._grid[ml.row][ml.column - 1] != \
-                Cell.BLOCKED:
+        if ml.column - 1 >= 0 and grid[index - 1] != _BLOCKED:
             locations.append(MazeLocation(ml.row, ml.column - 1))
         return locations
 
+    def grid_bfs(self) -> Optional[Node[MazeLocation]]:
+        return grid_bfs(self._grid, self._columns, self.index(self.start),
+                        self.index(self.goal), _BLOCKED, self.location)
+
+    def grid_astar(self) -> Optional[Node[MazeLocation]]:
+        return grid_astar(self._grid, self._columns, self.index(self.start),
+                          self.index(self.goal), _BLOCKED, self.location)
+
+    def _open(self, row: int, column: int) -> bool:
+        return 0 <= row < self._rows and 0 <= column < self._columns and \
+            self._grid[row * self._columns + column] != _BLOCKED
+
+    def _jump_vertical(self, row: int, column: int, step: int) -> int:
+        # row of the next jump point straight up or down, -1 if there is none
+        grid: bytearray = self._grid
+        stride: int = step * self._columns
+        index: int = row * self._columns + column
+        goal: int = self.index(self.goal)
+        left: bool = column > 0
+        right: bool = column < self._columns - 1
+        while True:
+            row += step
+            index += stride
+            if not 0 <= row < self._rows or grid[index] == _BLOCKED:
+                return -1
+            if index == goal:
+                return row
+            # a side cell that was blocked beside the previous row forces a
+            # horizontal turn here
+            if left and grid[index - 1] != _BLOCKED and \
+                    grid[index - stride - 1] == _BLOCKED:
+                return row
+            if right and grid[index + 1] != _BLOCKED and \
+                    grid[index - stride + 1] == _BLOCKED:
+                return row
+
+    def _jump_horizontal(self, row: int, column: int, step: int) -> int:
+        # column of the next jump point left or right, -1 if there is none
+        grid: bytearray = self._grid
+        index: int = row * self._columns + column
+        goal: int = self.index(self.goal)
+        while True:
+            column += step
+            index += step
+            if not 0 <= column < self._columns or grid[index] == _BLOCKED:
+                return -1
+            if index == goal:
+                return column
+            # horizontal runs may turn at any cell, so stop wherever a
+            # vertical run leads somewhere
+            if self._jump_vertical(row, column, 1) != -1 or \
+                    self._jump_vertical(row, column, -1) != -1:
+                return column
+
+    def _jump_directions(self,
+                         row: int,
+                         column: int,
+                         direction: Tuple[int, int]
+                         ) -> List[Tuple[int, int]]:
+        if direction == (0, 0):  # the start, nothing is pruned
+            return [(1, 0), (-1, 0), (0, 1), (0, -1)]
+        if direction[0] == 0:  # arrived horizontally
+            return [direction, (1, 0), (-1, 0)]
+        # arrived vertically: keep going and take the forced turns
+        return [direction] + [(0, step) for step in (1, -1)
+                              if self._open(row, column + step) and
+                              not self._open(row - direction[0],
+                                             column + step)]
+
+    def jump_point_search(self) -> Optional[Node[MazeLocation]]:
+        """
+        A* over the jump points of the 4-connected grid. Shortest paths are
+        only explored in a canonical horizontal-first order, which skips the
+        many symmetric paths A* would push through the heap. The returned
+        Node chain holds every cell of the path, not just the jump points.
+        """
+        goal: MazeLocation = self.goal
+
+        def distance(row: int, column: int) -> int:
+            return abs(row - goal.row) + abs(column - goal.column)
+
+        start: Tuple[int, int] = (self.start.row, self.start.column)
+        cost: Dict[Tuple[int, int], int] = {start: 0}
+        parent: Dict[Tuple[int, int], Optional[Tuple[int, int]]] = \
+            {start: None}
+        closed = set()
+        h: int = distance(*start)
+        frontier: List[tuple] = [(h, h, start, (0, 0))]
+
+        while frontier:
+            _, _, point, direction = heappop(frontier)
+            if point in closed:
+                continue  # stale entry
+            if point == (goal.row, goal.column):
+                return self._jump_path(parent, point)
+            closed.add(point)
+            row, column = point
+            for step_row, step_column in self._jump_directions(row, column,
+                                                               direction):
+                if step_row == 0:
+                    jump: Tuple[int, int] = \
+                        (row, self._jump_horizontal(row, column, step_column))
+                else:
+                    jump = (self._jump_vertical(row, column, step_row), column)
+                if -1 in jump or jump in closed:
+                    continue
+                new_cost: int = cost[point] + abs(jump[0] - row) + \
+                    abs(jump[1] - column)
+                if new_cost < cost.get(jump, new_cost + 1):
+                    cost[jump] = new_cost
+                    parent[jump] = point
+                    h = distance(*jump)
+                    heappush(frontier, (new_cost + h, h, jump,
+                                        (step_row, step_column)))
+
+        return None
+
+    def _jump_path(self,
+                   parent: Dict[Tuple[int, int], Optional[Tuple[int, int]]],
+                   point: Tuple[int, int]
+                   ) -> Node[MazeLocation]:
+        jump_points: List[Tuple[int, int]] = [point]
+        while parent[jump_points[-1]] is not None:
+            jump_points.append(parent[jump_points[-1]])
+        jump_points.reverse()
+        node: Node[MazeLocation] = Node(self.start, None)
+        # consecutive jump points share a row or a column, walk between them
+        for (row, column), (next_row, next_column) in zip(jump_points,
+                                                          jump_points[1:]):
+            step_row: int = (next_row > row) - (next_row < row)
+            step_column: int = (next_column > column) - (next_column < column)
+            while (row, column) != (next_row, next_column):
+                row += step_row
+                column += step_column
+                node = Node(MazeLocation(row, column), node, node.cost + 1)
+        return node
+
     def mark(self, path: List[MazeLocation]) -> None: 
         for maze_location in path:
-            self._grid[maze_location.row][maze_location.column] = Cell.PATH
-        self._grid[self.start.row][self.start.column] = Cell.START
-        self._grid[self.goal.row][self.goal.column] = Cell.GOAL
+            self._set(maze_location, Cell.PATH)
+        self._set(self.start, Cell.START)
+        self._set(self.goal, Cell.GOAL)
 
     def clear(self, path: List[MazeLocation]) -> None:
         for maze_location in path:
-            self._grid[maze_location.row][maze_location.column] = Cell.EMPTY
-        self._grid[self.start.row][self.start.column] = Cell.START
-        self._grid[self.goal.row][self.goal.column] = Cell.GOAL
+            self._set(maze_location, Cell.EMPTY)
+        self._set(self.start, Cell.START)
+        self._set(self.goal, Cell.GOAL)
+
+
+class MazeProblem(NamedTuple):
+    """Picklable description of a seeded Maze, for solve_many"""
+    rows: int = 10
+    columns: int = 10
+    sparseness: float = 0.2
+    seed: int = 0
+    with_heuristic: bool = False  # also pass manhattan_distance, for astar
+
+    def __call__(self) -> tuple:
+        m: Maze = Maze(self.rows, self.columns, self.sparseness,
+                       MazeLocation(0, 0),
+                       MazeLocation(self.rows - 1, self.columns - 1),
+                       self.seed)
+        if self.with_heuristic:
+            return m.start, m.goal_test, m.successors, \
+                manhattan_distance(m.goal)
+        return m.start, m.goal_test, m.successors
+
+
+class LandmarkIndex:
+    """
+    Preprocessed distances for answering many start/goal queries on one
+    Maze. Shortest distances from a few landmark cells give the ALT lower
+    bound |d(L, goal) - d(L, cell)| on the distance from cell to goal, which
+    is admissible and usually much tighter than the Manhattan distance.
+    Recent query results are kept in an LRU cache; both the tables and the
+    cache are rebuilt once the Maze's blocked cells change.
+    """
+    def __init__(self,
+                 maze: Maze,
+                 landmarks: int = 8,
+                 cache_size: int = 1024
+                 ) -> None:
+        self._maze: Maze = maze
+        self._landmark_count: int = landmarks
+        self._cache_size: int = cache_size
+        self._cache: OrderedDict = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.landmarks: List[MazeLocation] = []
+        self._tables: List[array] = []
+        self._version: int = -1
+        self._refresh()
+
+    def _distances(self, source: int) -> array:
+        # breadth-first distances from source, -1 where unreachable
+        grid: bytearray = self._maze._grid
+        columns: int = self._maze._columns
+        size: int = len(grid)
+        distances: array = array('i', [-1]) * size
+        distances[source] = 0
+        frontier: Deque[int] = deque([source])
+        while frontier:
+            current: int = frontier.popleft()
+            column: int = current % columns
+            for child, valid in ((current + columns, current + columns < size),
+                                 (current - columns, current >= columns),
+                                 (current + 1, column < columns - 1),
+                                 (current - 1, column > 0)):
+                if valid and distances[child] == -1 and \
+                        grid[child] != _BLOCKED:
+                    distances[child] = distances[current] + 1
+                    frontier.append(child)
+        return distances
+
+    def _refresh(self) -> None:
+        if self._version == self._maze.version:
+            return
+        self._cache.clear()
+        self.landmarks = []
+        self._tables = []
+        # farthest-point selection: each landmark is the reachable cell
+        # farthest from those already chosen, starting from the maze start
+        nearest: array = self._distances(self._maze.index(self._maze.start))
+        for _ in range(self._landmark_count):
+            farthest: int = max(range(len(nearest)),
+                                key=nearest.__getitem__)
+            if nearest[farthest] <= 0:
+                break  # every reachable cell is already a landmark
+            table: array = self._distances(farthest)
+            self.landmarks.append(self._maze.location(farthest))
+            self._tables.append(table)
+            for index, distance in enumerate(table):
+                if 0 <= distance < nearest[index]:
+                    nearest[index] = distance
+        self._version = self._maze.version
+
+    def heuristic(self, goal: MazeLocation) -> Callable[[MazeLocation], float]:
+        self._refresh()
+        columns: int = self._maze._columns
+        goal_index: int = self._maze.index(goal)
+        tables: List[Tuple[array, int]] = [(table, table[goal_index])
+                                           for table in self._tables]
+
+        def _distance(ml: MazeLocation) -> float:
+            best: float = abs(ml.row - goal.row) + abs(ml.column - goal.column)
+            index: int = ml.row * columns + ml.column
+            for table, to_goal in tables:
+                distance: int = table[index]
+                if (distance < 0) != (to_goal < 0):
+                    return float("inf")  # goal is in another component
+                if abs(distance - to_goal) > best:
+                    best = abs(distance - to_goal)
+            return best
+        return _distance
+
+    def path(self,
+             start: MazeLocation,
+             goal: MazeLocation
+             ) -> Optional[List[MazeLocation]]:
+        self._refresh()
+        key: Tuple[MazeLocation, MazeLocation] = (start, goal)
+        if key in self._cache:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        self.misses += 1
+        distance: Callable[[MazeLocation], float] = self.heuristic(goal)
+        path: Optional[List[MazeLocation]] = None
+        # the landmark tables already tell when goal cannot be reached
+        if distance(start) != float("inf"):
+            solution: Optional[Node[MazeLocation]] = astar(
+                start, goal.__eq__, self._maze.successors, distance)
+            if solution is not None:
+                path = node_to_path(solution)
+        self._cache[key] = path
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return path
 
 
 def euclidean_distance(goal: MazeLocation) -> Callable[[MazeLocation], float]:
@@ -115,11 +417,14 @@ if __name__ == "__main__":
     dfs_results: Dict[str, int] = {"path_length": 0}
     bfs_results: Dict[str, int] = {"path_length": 0}
     astar_results: Dict[str, int] = {"path_length": 0}
+    dfs_stats: SearchStats = SearchStats()
+    bfs_stats: SearchStats = SearchStats()
+    astar_stats: SearchStats = SearchStats()
 
     # Test DFS
     m: Maze = Maze()
     solution_1: Optional[Node[MazeLocation]] = dfs(m.start, m.goal_test,
-                                                   m.successors)
+                                                   m.successors, dfs_stats)
     if solution_1 is None:
         print(m)
         print("No solution found using depth-first search!")
@@ -132,7 +437,7 @@ if __name__ == "__main__":
 
     # Test BFS
     solution_2: Optional[Node[MazeLocation]] = bfs(m.start, m.goal_test,
-                                                   m.successors)
+                                                   m.successors, bfs_stats)
     if solution_2 is None:
         print(m)
         print("No solution found using breadth-first search!")
@@ -146,7 +451,8 @@ if __name__ == "__main__":
     # Test A*
     distance: Callable[[MazeLocation], float] = manhattan_distance(m.goal)
     solution_3: Optional[Node[MazeLocation]] = astar(m.start, m.goal_test,
-                                                     m.successors, distance)
+                                                     m.successors, distance,
+                                                     astar_stats)
     if solution_3 is None:
         print(m)
         print("No solution found using A*!")
@@ -158,6 +464,9 @@ if __name__ == "__main__":
         m.clear(path3)
 
     # printing results
-    print("Depth-first Algorithm: ", dfs_results['path_length'])
-    print("Breadth-first Algorithm: ", bfs_results['path_length'])
-    print("A* Algorithm: ", astar_results['path_length'])
+    for name, results, stats in (
+            ("Depth-first Algorithm: ", dfs_results, dfs_stats),
+            ("Breadth-first Algorithm: ", bfs_results, bfs_stats),
+            ("A* Algorithm: ", astar_results, astar_stats)):
+        print(name, results['path_length'],
+              f"({stats.expanded} expansions, {stats.elapsed * 1000:.2f} ms)")
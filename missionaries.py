@@ -1,16 +1,18 @@
 from __future__ import annotations
-from typing import List, Optional
+from typing import List, NamedTuple, Optional
 from generic_funcs.generic_search import bfs, Node, node_to_path
 
 MAX_NUM: int = 3
 
 
 class MCState:
-    def __init__(self, missionaries: int, cannibals: int, boat: bool) -> None:
+    def __init__(self, missionaries: int, cannibals: int, boat: bool,
+                 max_num: int = MAX_NUM) -> None:
+        self.max_num: int = max_num  # of each, all starting on the west
         self.wm: int = missionaries  # west missionaries
         self.wc: int = cannibals
-        self.em: int = MAX_NUM - self.wm  # east missionaries
-        self.ec: int = MAX_NUM - self.wc
+        self.em: int = max_num - self.wm  # east missionaries
+        self.ec: int = max_num - self.wc
         self.boat: bool = boat
 
     def __str__(self) -> str:
@@ -23,8 +25,18 @@ class MCState:
             f"The boat is at the {place} bank"
         )
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MCState):
+            return NotImplemented
+        return (self.wm, self.wc, self.boat, self.max_num) == \
+            (other.wm, other.wc, other.boat, other.max_num)
+
+    def __hash__(self) -> int:
+        return hash((self.wm, self.wc, self.boat, self.max_num))
+
     def goal_test(self) -> bool:
-        return self.is_legal and self.em == MAX_NUM and self.ec == MAX_NUM
+        return self.is_legal and self.em == self.max_num and \
+            self.ec == self.max_num
 
     @property
     def is_legal(self) -> bool:
@@ -34,33 +46,54 @@ class MCState:
             return False
         return True
 
+    # every crossing can be undone by the same people rowing back, so the
+    # successors of a state are also its predecessors (bidirectional search)
     def successors(self) -> List[MCState]:
         sucs: List[MCState] = []
         if self.boat:  # boat on the west
             if self.wm > 1:
-                sucs.append(MCState(self.wm - 2, self.wc, not self.boat))
+                sucs.append(MCState(self.wm - 2, self.wc, not self.boat,
+                                    self.max_num))
             if self.wm > 0:
-                sucs.append(MCState(self.wm - 1, self.wc, not self.boat))
+                sucs.append(MCState(self.wm - 1, self.wc, not self.boat,
+                                    self.max_num))
             if self.wc > 1:
-                sucs.append(MCState(self.wm, self.wc - 2, not self.boat))
+                sucs.append(MCState(self.wm, self.wc - 2, not self.boat,
+                                    self.max_num))
             if self.wc > 0:
-                sucs.append(MCState(self.wm, self.wc - 1, not self.boat))
+                sucs.append(MCState(self.wm, self.wc - 1, not self.boat,
+                                    self.max_num))
             if (self.wc > 0) and (self.wm > 0):
-                sucs.append(MCState(self.wm - 1, self.wc - 1, not self.boat))
+                sucs.append(MCState(self.wm - 1, self.wc - 1, not self.boat,
+                                    self.max_num))
         else:  # boat on the east
             if self.em > 1:
-                sucs.append(MCState(self.wm + 2, self.wc, not self.boat))
+                sucs.append(MCState(self.wm + 2, self.wc, not self.boat,
+                                    self.max_num))
             if self.em > 0:
-                sucs.append(MCState(self.wm + 1, self.wc, not self.boat))
+                sucs.append(MCState(self.wm + 1, self.wc, not self.boat,
+                                    self.max_num))
             if self.ec > 1:
-                sucs.append(MCState(self.wm, self.wc + 2, not self.boat))
+                sucs.append(MCState(self.wm, self.wc + 2, not self.boat,
+                                    self.max_num))
             if self.ec > 0:
-                sucs.append(MCState(self.wm, self.wc + 1, not self.boat))
+                sucs.append(MCState(self.wm, self.wc + 1, not self.boat,
+                                    self.max_num))
             if (self.ec > 0) and (self.em > 0):
-                sucs.append(MCState(self.wm + 1, self.wc + 1, not self.boat))
+                sucs.append(MCState(self.wm + 1, self.wc + 1, not self.boat,
+                                    self.max_num))
         return [x for x in sucs if x.is_legal]
 
 
+class MCProblem(NamedTuple):
+    """Picklable description of a missionaries problem, for solve_many"""
+    max_num: int = MAX_NUM
+
+    def __call__(self) -> tuple:
+        return MCState(self.max_num, self.max_num, True, self.max_num), \
+            MCState.goal_test, MCState.successors
+
+
 def display_solution(path_to_display: List[MCState]):
     if len(path_to_display) == 0:  # sanity check
         return
@@ -1,5 +1,8 @@
+import os
 from secrets import token_bytes
-from typing import Tuple
+from typing import BinaryIO, Optional, Tuple
+
+CHUNK_SIZE: int = 1 << 16  # bytes encrypted at a time by the stream API
 
 def random_key(length: int) -> int:
     #generates <length> random bytes
@@ -25,8 +28,97 @@ def decrypt(key1: int, key2: int) -> str:
     return temp.decode()
 
 
+def xor_bytes(data: bytes, key: bytes) -> bytes:
+    """data ^ key byte by byte; both must be the same length"""
+    if len(data) != len(key):
+        raise ValueError("The key must be as long as the data")
+    # a fixed width keeps leading zero bytes, unlike decrypt above
+    return (int.from_bytes(data, "little") ^
+            int.from_bytes(key, "little")).to_bytes(len(data), "little")
+
+
+def encrypt_bytes(original: bytes) -> Tuple[bytes, bytes]:
+    """Returns (key, encrypted), each as long as original"""
+    key: bytes = token_bytes(len(original))
+    return key, xor_bytes(original, key)
+
+
+def decrypt_bytes(key: bytes, encrypted: bytes) -> bytes:
+    return xor_bytes(encrypted, key)
+
+
+def _xor_stream(source: BinaryIO,
+                destination: BinaryIO,
+                key_source: Optional[BinaryIO] = None,
+                key_destination: Optional[BinaryIO] = None,
+                chunk_size: int = CHUNK_SIZE) -> int:
+    # reads source into one reused buffer, so memory stays at a few chunks
+    # whatever the size of the stream; the key comes from key_source, or
+    # fresh from os.urandom and is then written to key_destination
+    buffer: bytearray = bytearray(chunk_size)
+    view: memoryview = memoryview(buffer)
+    total: int = 0
+    while True:
+        size: int = source.readinto(buffer)
+        if not size:
+            return total
+        if key_source is None:
+            key: bytes = os.urandom(size)
+            key_destination.write(key)
+        else:
+            key = key_source.read(size)
+            if len(key) != size:
+                raise ValueError("The key is shorter than the data")
+        destination.write(xor_bytes(view[:size], key))
+        total += size
+
+
+def encrypt_stream(source: BinaryIO,
+                   destination: BinaryIO,
+                   key_destination: BinaryIO,
+                   chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Encrypts source into destination with a new key as long as it, written
+    to key_destination, chunk_size bytes at a time. Returns the length.
+    """
+    return _xor_stream(source, destination, key_destination=key_destination,
+                       chunk_size=chunk_size)
+
+
+def decrypt_stream(source: BinaryIO,
+                   key_source: BinaryIO,
+                   destination: BinaryIO,
+                   chunk_size: int = CHUNK_SIZE) -> int:
+    """Decrypts what encrypt_stream wrote. Returns the length."""
+    return _xor_stream(source, destination, key_source=key_source,
+                       chunk_size=chunk_size)
+
+
+def encrypt_file(path: str,
+                 encrypted_path: str,
+                 key_path: str,
+                 chunk_size: int = CHUNK_SIZE) -> int:
+    with open(path, "rb") as source, \
+            open(encrypted_path, "wb") as destination, \
+            open(key_path, "wb") as key_destination:
+        return encrypt_stream(source, destination, key_destination,
+                              chunk_size)
+
+
+def decrypt_file(encrypted_path: str,
+                 key_path: str,
+                 path: str,
+                 chunk_size: int = CHUNK_SIZE) -> int:
+    with open(encrypted_path, "rb") as source, \
+            open(key_path, "rb") as key_source, \
+            open(path, "wb") as destination:
+        return decrypt_stream(source, key_source, destination, chunk_size)
+
+
 if __name__ == "__main__":
     key1, key2 = encrypt("The world is just encrypted.")
     result : str = decrypt(key1, key2)
     print(result)
+    key, encrypted = encrypt_bytes(b"\x00\x00leading zeros survive")
+    print(decrypt_bytes(key, encrypted))
 